@@ -16,6 +16,8 @@ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 GNU General Public License for more details.
 
 """
+from pathlib import Path
+
 from nvlib.controller.plugin.plugin_base import PluginBase
 from nvupdater.nvupdater_globals import HELP_PAGE
 from nvupdater.nvupdater_locale import _
@@ -30,6 +32,30 @@ class Plugin(PluginBase):
     URL = 'https://github.com/peter88213/nv_updater'
     HELP_PAGE = HELP_PAGE
 
+    INI_FILENAME = 'updater.ini'
+    INI_FILEPATH = '.novx/config'
+    SETTINGS = dict(
+        engine='threads',
+        max_workers=8,
+        cache_ttl=3600,
+        connect_timeout=5,
+        read_timeout=10,
+        check_timeout=60,
+        retries=2,
+        rate_limit=10,
+        download_workers=4,
+        auto_check_delay=30,
+        auto_check_interval=86400,
+        timing_log='',
+        version_index='',
+        mirror='',
+        daemon_socket='',
+    )
+    OPTIONS = dict(
+        auto_check=False,
+        beta_channel=False,
+    )
+
     def install(self, model, view, controller):
         """Install the plugin at runtime.
         
@@ -41,7 +67,25 @@ class Plugin(PluginBase):
         Extends the superclass method.
         """
         super().install(model, view, controller)
-        self.updateService = UpdateService(model, view, controller)
+
+        #--- Load configuration.
+        try:
+            homeDir = str(Path.home()).replace('\\', '/')
+            configDir = f'{homeDir}/{self.INI_FILEPATH}'
+        except:
+            configDir = '.'
+        self.iniFile = f'{configDir}/{self.INI_FILENAME}'
+        self.configuration = self._mdl.nvService.new_configuration(
+            settings=self.SETTINGS,
+            options=self.OPTIONS
+            )
+        self.configuration.read(self.iniFile)
+        self.prefs = {}
+        self.prefs.update(self.configuration.settings)
+        self.prefs.update(self.configuration.options)
+
+        # The update service is created on first use.
+        self.updateService = None
         self._icon = self._get_icon('update.png')
 
         #--- Configure the user interface.
@@ -52,8 +96,46 @@ class Plugin(PluginBase):
             label=label,
             image=self._icon,
             compound='left',
-            command=self.updateService.check_for_updates,
+            command=self.check_for_updates,
         )
 
         self._add_help_menu_entry(_('Update checker plugin help'))
 
+        # Start the background checks, if enabled.
+        # Defer it until the application is ready.
+        if self.prefs['auto_check']:
+            self._ui.root.after_idle(self.start_scheduler)
+
+    def check_for_updates(self):
+        """Check novelibre and all installed plugins for updates."""
+        self._get_update_service().check_for_updates()
+
+    def on_quit(self):
+        """Write back the configuration file.
+        
+        Overrides the superclass method.
+        """
+        if self.updateService is not None:
+            self.updateService.stop_scheduler()
+        for keyword in self.prefs:
+            if keyword in self.configuration.options:
+                self.configuration.options[keyword] = self.prefs[keyword]
+            elif keyword in self.configuration.settings:
+                self.configuration.settings[keyword] = self.prefs[keyword]
+        self.configuration.write(self.iniFile)
+
+    def start_scheduler(self):
+        """Start periodic background checks."""
+        self._get_update_service().start_scheduler()
+
+    def _get_update_service(self):
+        # Return the update service; create it on first use,
+        # so the caches are not read at novelibre startup.
+        if self.updateService is None:
+            self.updateService = UpdateService(
+                self._mdl,
+                self._ui,
+                self._ctrl,
+                self.prefs,
+            )
+        return self.updateService
@@ -0,0 +1,561 @@
+"""Provide a class for remote version lookups on an asyncio event loop.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from collections import deque
+import random
+import socket
+import threading
+import time
+from urllib.parse import urljoin
+from urllib.parse import urlsplit
+
+from nvupdater.connection_pool import Response
+from nvupdater.lookup_result import LookupResult
+from nvupdater.lookup_timing import LookupTiming
+from nvupdater.rate_limiter import RateLimiter
+
+
+class _PipelinedConnection:
+    """A keep-alive HTTP/1.1 connection sending pipelined requests.
+
+    Requests are written as soon as they are issued;
+    the responses are read in the same order by a single reader task.
+    """
+
+    def __init__(self, reader, writer, readTimeout):
+        self._reader = reader
+        self._writer = writer
+        self._readTimeout = readTimeout
+        self._pending = deque()
+        self._readerTask = None
+        self.closed = False
+        self.used = False
+        self.aborted = False
+        # True if queued requests failed due to an earlier error
+
+    @property
+    def load(self):
+        """Number of requests waiting for a response."""
+        return len(self._pending)
+
+    def abort(self):
+        """Cancel the reader task and close the connection."""
+        if self._readerTask is not None:
+            self._readerTask.cancel()
+        self.close()
+
+    def close(self):
+        self.closed = True
+        self._writer.close()
+
+    async def request(self, hostHeader, path, headers):
+        """Send a GET request; return a (status, headers, body) tuple."""
+        import asyncio
+
+        future = asyncio.get_event_loop().create_future()
+        self._pending.append(future)
+        lines = [
+            f'GET {path} HTTP/1.1',
+            f'Host: {hostHeader}',
+            'Accept-Encoding: identity',
+            'Connection: keep-alive',
+        ]
+        for name in headers:
+            lines.append(f'{name}: {headers[name]}')
+        request = '\r\n'.join(lines) + '\r\n\r\n'
+        self._writer.write(request.encode('latin-1'))
+        self.used = True
+        if self._readerTask is None:
+            self._readerTask = asyncio.ensure_future(self._read_responses())
+        return await future
+
+    async def _read_body(self, status, responseHeaders):
+        # Return the body and a flag indicating the connection is closed.
+        if status < 200 or status in (204, 304):
+            return b'', False
+
+        if 'chunked' in responseHeaders.get('Transfer-Encoding', '').lower():
+            chunks = []
+            while True:
+                sizeLine = await self._reader.readline()
+                size = int(sizeLine.split(b';')[0].strip(), 16)
+                if size == 0:
+                    break
+
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readline()
+            while (await self._reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+                # skipping the trailer
+            return b''.join(chunks), False
+
+        contentLength = responseHeaders.get('Content-Length', None)
+        if contentLength is not None:
+            return await self._reader.readexactly(int(contentLength)), False
+
+        return await self._reader.read(), True
+
+    async def _read_response(self):
+        # Return a (status, headers, body, willClose) tuple.
+        from email.parser import BytesParser
+        import http.client
+
+        statusLine = await self._reader.readline()
+        if not statusLine:
+            raise ConnectionResetError('Connection closed by server')
+
+        version, status = statusLine.decode('latin-1').split(None, 2)[:2]
+        status = int(status)
+        headerLines = []
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+
+            headerLines.append(line)
+        responseHeaders = BytesParser(
+            _class=http.client.HTTPMessage,
+        ).parsebytes(b''.join(headerLines))
+        body, willClose = await self._read_body(status, responseHeaders)
+        connectionHeader = responseHeaders.get('Connection', '').lower()
+        if connectionHeader == 'close':
+            willClose = True
+        elif version == 'HTTP/1.0' and connectionHeader != 'keep-alive':
+            willClose = True
+        return status, responseHeaders, body, willClose
+
+    async def _read_responses(self):
+        # Reader task: resolve the pending requests in order.
+        import asyncio
+
+        try:
+            while self._pending:
+                try:
+                    (status,
+                     responseHeaders,
+                     body,
+                     willClose) = await asyncio.wait_for(
+                        self._read_response(),
+                        self._readTimeout,
+                    )
+                except asyncio.TimeoutError:
+                    raise socket.timeout('timed out')
+
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_result((status, responseHeaders, body))
+                if willClose:
+                    raise ConnectionResetError('Connection closed by server')
+
+        except BaseException as ex:
+            # The request in progress fails with the original error.
+            self.close()
+            if isinstance(ex, socket.timeout):
+                # The server stalls; the requests queued behind
+                # would time out as well.
+                queuedError = socket.timeout('timed out')
+            else:
+                # The requests queued behind can be sent again.
+                queuedError = ConnectionResetError('Pipeline aborted')
+            error = ex
+            while self._pending:
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_exception(error)
+                error = queuedError
+                self.aborted = True
+            if isinstance(ex, asyncio.CancelledError):
+                raise
+
+        finally:
+            self._readerTask = None
+
+
+class _HostConnections:
+    """The pipelined connections to a single host."""
+
+    def __init__(self, scheme, host, port, engine):
+        import asyncio
+
+        self._scheme = scheme
+        self._host = host
+        self._port = port
+        self._engine = engine
+        self._connections = []
+        self._lock = asyncio.Lock()
+        if (scheme, port) in (('http', 80), ('https', 443)):
+            self.hostHeader = host
+        else:
+            self.hostHeader = f'{host}:{port}'
+
+    def abort(self):
+        for connection in self._connections:
+            connection.abort()
+        self._connections = []
+
+    async def acquire(self, timing):
+        """Return the least loaded connection, opening a new one if useful."""
+        async with self._lock:
+            self._connections = [c for c in self._connections if not c.closed]
+            connection = None
+            if self._connections:
+                connection = min(self._connections, key=lambda c: c.load)
+            if (
+                connection is None
+                or connection.load >= self._engine.maxPipelineDepth
+                and len(self._connections) < self._engine.maxConnections
+            ):
+                connection = await self._open(timing)
+                self._connections.append(connection)
+            return connection
+
+    async def _open(self, timing):
+        import asyncio
+
+        start = time.perf_counter()
+        if self._scheme == 'https':
+            sslContext = self._engine.sslContext
+            serverHostname = self._host
+        else:
+            sslContext = None
+            serverHostname = None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    self._host,
+                    self._port,
+                    ssl=sslContext,
+                    server_hostname=serverHostname,
+                ),
+                self._engine.connectTimeout,
+            )
+        except asyncio.TimeoutError:
+            raise socket.timeout('timed out')
+
+        if timing is not None:
+            timing.connect += time.perf_counter() - start
+        return _PipelinedConnection(
+            reader,
+            writer,
+            self._engine.readTimeout,
+        )
+
+
+class AsyncLookupEngine:
+    """Fetch the VERSION files of many repositories from one event loop.
+
+    All lookups run as coroutines on a single thread. Connections are
+    kept alive and reused per host, with HTTP/1.1 pipelining.
+    Redirects are followed.
+    The mirror, the cache, and the version index are consulted
+    via the RemoteData instance, just like with the LookupEngine.
+    The run() method yields the same LookupResult instances.
+    The requests are subject to the per-host rate limiter.
+
+    Note: Proxies are not supported.
+    """
+    MAX_CONCURRENCY = 8
+    MAX_PIPELINE_DEPTH = 2
+    # maximum number of requests in flight per connection
+    MAX_REDIRECTS = 5
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+    USER_AGENT = 'nv_updater'
+
+    def __init__(
+            self,
+            remoteData,
+            maxWorkers=None,
+            timeout=None,
+            connectTimeout=None,
+            readTimeout=None,
+            rateLimiter=None,
+        ):
+        """Set the lookup parameters.
+
+        Positional arguments:
+            remoteData -- RemoteData instance providing the local data sources
+                          and the processing of the responses.
+
+        Optional arguments:
+            maxWorkers: int -- maximum number of concurrent lookups.
+            timeout: float -- overall deadline of a check in seconds.
+            connectTimeout: float -- timeout in seconds
+                                     for establishing a connection.
+            readTimeout: float -- timeout in seconds for each response.
+            rateLimiter -- RateLimiter instance; 
+                           if None, a new one is created.
+        """
+        import ssl
+
+        if not maxWorkers or maxWorkers < 1:
+            maxWorkers = self.MAX_CONCURRENCY
+        self.maxWorkers = maxWorkers
+        if timeout is not None and timeout <= 0:
+            timeout = None
+        self.timeout = timeout
+        self.connectTimeout = connectTimeout or 5
+        self.readTimeout = readTimeout or 10
+        self.maxPipelineDepth = self.MAX_PIPELINE_DEPTH
+        self.maxConnections = max(
+            1,
+            -(-self.maxWorkers // self.maxPipelineDepth),
+        )
+        # connections per host, enough for maxWorkers pipelined requests
+        self.sslContext = ssl.create_default_context()
+        if rateLimiter is None:
+            rateLimiter = RateLimiter()
+        self.rateLimiter = rateLimiter
+        self._remoteData = remoteData
+        self._hosts = {}
+        self._loop = None
+        self._tasks = {}
+        self._semaphore = None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Cancel all outstanding lookups; may be called from any thread."""
+        self._cancelled.set()
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._cancel_tasks)
+            except RuntimeError:
+                pass
+                # the loop was closed in the meantime
+
+    def run(self, repoUrls):
+        """Generator yielding LookupResult instances as lookups complete.
+
+        Positional arguments:
+            repoUrls: dict -- repository URLs by repository name.
+
+        When the deadline has passed, all outstanding lookups
+        are yielded as timed out.
+        Cancelled lookups are not yielded.
+        """
+        import asyncio
+
+        if self.timeout is None:
+            deadline = None
+        else:
+            deadline = time.monotonic() + self.timeout
+        self._cancelled.clear()
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._hosts = {}
+        self._semaphore = asyncio.Semaphore(self.maxWorkers)
+        self._tasks = {}
+        for repoName in repoUrls:
+            timing = LookupTiming(repoName, repoUrls[repoName])
+            task = loop.create_task(self._lookup(repoUrls[repoName], timing))
+            self._tasks[task] = timing
+        pending = set(self._tasks)
+        try:
+            while pending and not self._cancelled.is_set():
+                if deadline is None:
+                    remaining = None
+                else:
+                    remaining = max(deadline - time.monotonic(), 0)
+                done, pending = loop.run_until_complete(asyncio.wait(
+                    pending,
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED,
+                ))
+                if not done:
+                    # The deadline has passed.
+                    for task in pending:
+                        timing = self._tasks[task]
+                        timing.stop()
+                        yield LookupResult(
+                            timing.repoName,
+                            LookupResult.TIMED_OUT,
+                            timing=timing,
+                        )
+                    break
+
+                for task in done:
+                    if task.cancelled() or self._cancelled.is_set():
+                        continue
+
+                    timing = self._tasks[task]
+                    error = task.exception()
+                    if error is None:
+                        yield LookupResult(
+                            timing.repoName,
+                            LookupResult.OK,
+                            data=task.result(),
+                            timing=timing,
+                        )
+                    else:
+                        yield LookupResult.from_error(
+                            timing.repoName,
+                            error,
+                            timing=timing,
+                        )
+        finally:
+            self._shut_down(loop)
+
+    def _cancel_tasks(self):
+        for task in self._tasks:
+            task.cancel()
+
+    async def _fetch(self, url, headers, timing):
+        # Return a Response instance; follow redirects.
+        import http.client
+
+        redirects = 0
+        while True:
+            status, responseHeaders, body = await self._request(
+                url,
+                headers,
+                timing,
+            )
+            location = responseHeaders.get('Location', None)
+            if status not in self.REDIRECT_CODES or not location:
+                return Response(
+                    url,
+                    status,
+                    responseHeaders,
+                    body,
+                    redirects=redirects,
+                )
+
+            redirects += 1
+            timing.redirects += 1
+            if redirects > self.MAX_REDIRECTS:
+                raise http.client.HTTPException(
+                    f'Too many redirects: {url}'
+                )
+
+            url = urljoin(url, location)
+
+    async def _fetch_with_retries(self, url, headers, timing):
+        # Return a Response instance; retry on transient errors.
+        import asyncio
+        import http.client
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._fetch(url, headers, timing)
+            except (OSError, http.client.HTTPException):
+                if attempt >= self._remoteData.retries:
+                    raise
+
+            else:
+                if (
+                    response.status not in self._remoteData.RETRY_STATUS
+                    or attempt >= self._remoteData.retries
+                ):
+                    return response
+
+            await asyncio.sleep(
+                random.uniform(0, self._remoteData.backoff * 2 ** attempt)
+            )
+            attempt += 1
+
+    async def _lookup(self, repoUrl, timing):
+        # Return the version data of a single repository.
+        timing.start()
+        try:
+            result = self._remoteData.get_local_data(repoUrl, timing=timing)
+            if result is not None:
+                return result
+
+            async with self._semaphore:
+                timing.start()
+                # not counting the time waiting for the semaphore
+                response = await self._fetch_with_retries(
+                    self._remoteData.get_version_url(repoUrl),
+                    self._remoteData.get_request_headers(repoUrl),
+                    timing,
+                )
+            return self._remoteData.process_response(
+                repoUrl,
+                response,
+                timing=timing,
+            )
+
+        finally:
+            timing.stop()
+
+    async def _request(self, url, headers, timing):
+        # Send one request on a pooled connection.
+        # A reused connection closed by the server is replaced once.
+        import asyncio
+        import http.client
+
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise http.client.HTTPException(f'Unsupported scheme: {scheme}')
+
+        port = parts.port
+        if port is None:
+            if scheme == 'https':
+                port = 443
+            else:
+                port = 80
+        key = (scheme, parts.hostname, port)
+        if key not in self._hosts:
+            self._hosts[key] = _HostConnections(*key, self)
+        hostConnections = self._hosts[key]
+        path = parts.path or '/'
+        if parts.query:
+            path = f'{path}?{parts.query}'
+        requestHeaders = {'User-Agent': self.USER_AGENT}
+        requestHeaders.update(headers)
+        delay = self.rateLimiter.reserve(parts.hostname)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        retried = False
+        while True:
+            connection = await hostConnections.acquire(timing)
+            reused = connection.used
+            start = time.perf_counter()
+            try:
+                status, responseHeaders, body = await connection.request(
+                    hostConnections.hostHeader,
+                    path,
+                    requestHeaders,
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if (reused or connection.aborted) and not retried:
+                    retried = True
+                    continue
+
+                raise
+
+            timing.firstByte += time.perf_counter() - start
+            timing.requests += 1
+            timing.bodySize += len(body)
+            self.rateLimiter.update(parts.hostname, status, responseHeaders)
+            return status, responseHeaders, body
+
+    def _shut_down(self, loop):
+        # Cancel the outstanding tasks, close all connections and the loop.
+        import asyncio
+
+        self._loop = None
+        self._cancel_tasks()
+        try:
+            loop.run_until_complete(
+                asyncio.gather(*self._tasks, return_exceptions=True)
+            )
+        except RuntimeError:
+            pass
+        for hostConnections in self._hosts.values():
+            hostConnections.abort()
+        self._hosts = {}
+        try:
+            remainingTasks = asyncio.all_tasks(loop)
+            loop.run_until_complete(
+                asyncio.gather(*remainingTasks, return_exceptions=True)
+            )
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -0,0 +1,165 @@
+"""Provide a class for periodic background update checks.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from nvupdater.lookup_result import LookupResult
+from nvupdater.nvupdater_locale import _
+from nvupdater.update_checker import UpdateChecker
+from nvupdater.update_checker import collect_repositories
+from nvupdater.update_resolver import plan_updates
+
+
+class CheckScheduler:
+    """Run silent update checks in the background.
+    
+    The first check starts a while after novelibre's startup,
+    then the check is repeated periodically.
+    The user is notified only if updates are available.
+    """
+    POLL_INTERVAL = 500
+    # milliseconds between two result queue checks
+    RETRY_DELAY = 60000
+    # milliseconds to wait if another check is in progress
+
+    def __init__(
+            self,
+            model,
+            view,
+            controller,
+            prefs,
+            versionCache,
+            rateLimiter=None,
+            checkSnapshot=None,
+        ):
+        """Set the scheduling parameters.
+        
+        Positional arguments:
+            model -- reference to the novelibre main model instance.
+            view -- reference to the novelibre main view instance.
+            controller -- reference to the novelibre main controller instance.
+            prefs: dict -- the plugin's settings.
+            versionCache -- VersionCache instance shared by all checks.
+
+        Optional arguments:
+            rateLimiter -- RateLimiter instance shared by all checks.
+            checkSnapshot -- CheckSnapshot instance to store the results in.
+        """
+        self._mdl = model
+        self._ui = view
+        self._ctrl = controller
+        self._delay = int(prefs['auto_check_delay']) * 1000
+        self._interval = int(prefs['auto_check_interval']) * 1000
+        self._beta = prefs.get('beta_channel', False)
+        self._updateChecker = UpdateChecker(
+            prefs,
+            versionCache=versionCache,
+            rateLimiter=rateLimiter,
+        )
+        self._checkSnapshot = checkSnapshot
+        self._afterId = None
+        self._currentVersions = {}
+        self._releases = {}
+        self._cancelled = False
+        # if True, the results of the running check are discarded
+        self.isBlocked = False
+        # if True, scheduled checks are skipped
+
+    def cancel_check(self):
+        """Stop a running check; keep the schedule.
+        
+        The results of the stopped check are discarded.
+        """
+        self._cancelled = True
+        self._updateChecker.stop()
+
+    def is_running(self):
+        """Return True if a scheduled check is in progress."""
+        return self._updateChecker.is_running()
+
+    def start(self):
+        """Schedule the first check."""
+        self._schedule(self._delay)
+
+    def stop(self):
+        """Stop a running check and cancel the schedule."""
+        self._cancel_timer()
+        self._updateChecker.stop()
+
+    def _cancel_timer(self):
+        if self._afterId is not None:
+            self._ui.root.after_cancel(self._afterId)
+            self._afterId = None
+
+    def _finish_check(self):
+        # Notify the user of updates; store the results in the snapshot.
+        plan = plan_updates(
+            self._releases,
+            self._currentVersions,
+            beta=self._beta,
+        )
+        outdated = [
+            repoName for repoName in self._releases
+            if plan[repoName].update is not None
+        ]
+        if outdated:
+            self._notify(outdated)
+        if self._checkSnapshot is not None:
+            for repoName in self._releases:
+                self._checkSnapshot.store_resolution(
+                    repoName,
+                    self._currentVersions[repoName],
+                    plan[repoName],
+                )
+            self._checkSnapshot.write()
+
+    def _notify(self, outdated):
+        # Show the outdated components in the status bar.
+        self._ui.set_status(
+            f"{_('Updates available')}: {', '.join(outdated)}"
+        )
+
+    def _process_results(self):
+        # Collect the releases; notify when the check is done.
+        self._afterId = None
+        for result in self._updateChecker.get_results():
+            if result is None:
+                if not self._cancelled:
+                    self._finish_check()
+                self._releases = {}
+                if self._interval > 0:
+                    self._schedule(self._interval)
+                return
+
+            if self._cancelled:
+                continue
+
+            if result.status == LookupResult.OK:
+                self._releases[result.repoName] = result.data
+        self._afterId = self._ui.root.after(
+            self.POLL_INTERVAL,
+            self._process_results,
+        )
+
+    def _run_check(self):
+        # Start a silent check, unless another check is in progress.
+        self._afterId = None
+        if self.isBlocked or self._updateChecker.is_running():
+            self._schedule(self.RETRY_DELAY)
+            return
+
+        self._currentVersions, repoUrls = collect_repositories(
+            self._ctrl.plugins
+        )
+        self._releases = {}
+        self._cancelled = False
+        self._updateChecker.start(repoUrls)
+        self._afterId = self._ui.root.after(
+            self.POLL_INTERVAL,
+            self._process_results,
+        )
+
+    def _schedule(self, delay):
+        self._cancel_timer()
+        self._afterId = self._ui.root.after(max(delay, 0), self._run_check)
@@ -0,0 +1,183 @@
+"""Provide a class for the stored results of the last update check.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import os
+import threading
+import time
+
+
+class CheckSnapshot:
+    """The last known check result per component, stored in a JSON file.
+
+    Each row holds the installed and the latest version strings,
+    the download link and checksum of an update, the status,
+    and the time of the check:
+
+    {
+      "nv_updater": {
+        "installed": "5.4.4",
+        "latest": "5.4.5",
+        "download_link": "https://...",
+        "sha256": null,
+        "status": "outdated",
+        "checked": 1735689600.0
+      }
+    }
+
+    Rows of components whose lookup failed are kept from earlier checks.
+    """
+    OUTDATED = 'outdated'
+    CURRENT = 'current'
+    # row status values
+    MAX_AGE = 86400
+    # default age in seconds after which a row is stale
+
+    def __init__(self, filePath, maxAge=None):
+        """Read the snapshot file, if any.
+
+        Positional arguments:
+            filePath: str -- path to the JSON snapshot file.
+
+        Optional arguments:
+            maxAge: int -- age in seconds after which a row is stale.
+        """
+        self.filePath = filePath
+        if maxAge is None or maxAge < 0:
+            maxAge = self.MAX_AGE
+        self.maxAge = maxAge
+        self._rows = {}
+        self._changed = False
+        self._lock = threading.Lock()
+        self.read()
+
+    def get(self, repoName):
+        """Return a copy of the row for repoName, or None."""
+        with self._lock:
+            row = self._rows.get(repoName, None)
+            if row is None:
+                return None
+
+            return dict(row)
+
+    def is_stale(self, row, installed):
+        """Return True if row may no longer be valid.
+
+        Positional arguments:
+            row: dict -- a row returned by get().
+            installed: str -- the currently installed version, or None.
+
+        A row is stale if it is older than maxAge, or if it was
+        checked for another installed version.
+        """
+        if row.get('installed', None) != installed:
+            return True
+
+        return time.time() - row.get('checked', 0) > self.maxAge
+
+    def read(self):
+        """Load the rows from the snapshot file.
+
+        A missing or corrupt file results in an empty snapshot.
+        """
+        try:
+            with open(self.filePath, 'r', encoding='utf-8') as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            rows = {}
+        if not isinstance(rows, dict):
+            rows = {}
+        rows = {
+            repoName: row for repoName, row in rows.items()
+            if isinstance(row, dict)
+        }
+        with self._lock:
+            self._rows = rows
+            self._changed = False
+
+    def store(
+            self,
+            repoName,
+            installed,
+            latest,
+            status,
+            downloadLink=None,
+            sha256=None,
+        ):
+        """Add or replace the row for repoName.
+
+        Positional arguments:
+            repoName: str -- name of the component.
+            installed: str -- the installed version, or None if unknown.
+            latest: str -- the latest version, or None if unknown.
+            status: str -- OUTDATED or CURRENT.
+
+        Optional arguments:
+            downloadLink: str -- the download URL of an update.
+            sha256: str -- the update's SHA-256 checksum, if published.
+        """
+        row = dict(
+            installed=installed,
+            latest=latest,
+            download_link=downloadLink,
+            sha256=sha256,
+            status=status,
+            checked=time.time(),
+        )
+        with self._lock:
+            self._rows[repoName] = row
+            self._changed = True
+
+    def store_resolution(self, repoName, installed, resolution):
+        """Add or replace the row for repoName with a check result.
+
+        Positional arguments:
+            repoName: str -- name of the component.
+            installed: Version -- the installed version, or None if unknown.
+            resolution -- Resolution instance of the update resolver.
+        """
+        if installed is not None:
+            installed = str(installed)
+        update = resolution.update
+        if update is not None:
+            self.store(
+                repoName,
+                installed,
+                str(update.version),
+                self.OUTDATED,
+                downloadLink=update.downloadLink,
+                sha256=update.sha256,
+            )
+        elif resolution.latest is not None:
+            self.store(
+                repoName,
+                installed,
+                str(resolution.latest.version),
+                self.CURRENT,
+            )
+        else:
+            self.store(repoName, installed, None, self.CURRENT)
+
+    def write(self):
+        """Save the rows to the snapshot file, if changed.
+
+        The file is replaced atomically.
+        Errors are ignored, because the snapshot is not essential.
+        """
+        with self._lock:
+            if not self._changed:
+                return
+
+            rows = json.dumps(self._rows, indent=1)
+            self._changed = False
+        tempPath = f'{self.filePath}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.filePath), exist_ok=True)
+            with open(tempPath, 'w', encoding='utf-8') as f:
+                f.write(rows)
+            os.replace(tempPath, self.filePath)
+        except OSError:
+            pass
@@ -0,0 +1,278 @@
+"""Provide a class for pooled persistent HTTP connections.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import threading
+import time
+from urllib.parse import urljoin
+from urllib.parse import urlsplit
+
+from nvupdater.rate_limiter import RateLimiter
+
+
+class Response:
+    """A completely read HTTP response."""
+
+    def __init__(self, url, status, headers, body, redirects=0):
+        """Store the response data.
+        
+        Positional arguments:
+            url: str -- URL of the final request after redirection.
+            status: int -- HTTP status code.
+            headers -- http.client.HTTPMessage instance.
+            body: bytes -- response body.
+        
+        Optional arguments:
+            redirects: int -- number of redirects followed.
+        """
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.redirects = redirects
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections, reused per host.
+    
+    The pool follows redirects itself, so the connections to both
+    the original and the redirection target host are kept open.
+    Thus the TLS handshake is done once per host, not once per request.
+    The pool is thread-safe; each connection is used
+    by one thread at a time.
+    Each request, including redirects, is subject to the per-host
+    rate limiter.
+    """
+    MAX_IDLE = 8
+    # maximum number of idle connections kept per host
+    CONNECT_TIMEOUT = 5
+    READ_TIMEOUT = 10
+    # default timeouts in seconds
+    MAX_REDIRECTS = 5
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+    USER_AGENT = 'nv_updater'
+
+    def __init__(
+            self,
+            maxIdle=None,
+            connectTimeout=None,
+            readTimeout=None,
+            rateLimiter=None,
+        ):
+        """Initialize the idle connection store.
+        
+        Optional arguments:
+            maxIdle: int -- maximum number of idle connections per host.
+            connectTimeout: float -- timeout in seconds 
+                                     for establishing a connection.
+            readTimeout: float -- timeout in seconds
+                                  for each read from a connection.
+            rateLimiter -- RateLimiter instance; 
+                           if None, a new one is created.
+        """
+        import ssl
+        from urllib.request import getproxies
+
+        if maxIdle is None:
+            maxIdle = self.MAX_IDLE
+        self.maxIdle = maxIdle
+        if not connectTimeout or connectTimeout <= 0:
+            connectTimeout = self.CONNECT_TIMEOUT
+        self.connectTimeout = connectTimeout
+        if not readTimeout or readTimeout <= 0:
+            readTimeout = self.READ_TIMEOUT
+        self.readTimeout = readTimeout
+        if rateLimiter is None:
+            rateLimiter = RateLimiter()
+        self.rateLimiter = rateLimiter
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._sslContext = ssl.create_default_context()
+        self._proxies = getproxies()
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def get(self, url, headers=None, timing=None):
+        """Send a GET request and return a Response instance.
+        
+        Positional arguments:
+            url: str -- URL of the requested resource.
+        
+        Optional arguments:
+            headers: dict -- additional request headers.
+            timing -- LookupTiming instance to record the timings in.
+        
+        Redirects are followed.
+        Raise http.client.HTTPException or OSError on failure;
+        socket.timeout if the connect or read timeout is exceeded;
+        RateLimitExceeded if the host's request quota is exhausted.
+        """
+        import http.client
+
+        requestHeaders = {'User-Agent': self.USER_AGENT}
+        if headers:
+            requestHeaders.update(headers)
+        redirects = 0
+        while True:
+            status, responseHeaders, body = self._request(
+                url,
+                requestHeaders,
+                timing,
+            )
+            location = responseHeaders.get('Location', None)
+            if status not in self.REDIRECT_CODES or not location:
+                return Response(
+                    url,
+                    status,
+                    responseHeaders,
+                    body,
+                    redirects=redirects,
+                )
+
+            redirects += 1
+            if timing is not None:
+                timing.redirects += 1
+            if redirects > self.MAX_REDIRECTS:
+                raise http.client.HTTPException(
+                    f'Too many redirects: {url}'
+                )
+
+            url = urljoin(url, location)
+
+    def _acquire(self, key, timing):
+        # Return an idle connection for key, or a new one.
+        with self._lock:
+            connections = self._idle.get(key, None)
+            if connections:
+                return connections.pop(), True
+
+        start = time.perf_counter()
+        connection = self._connect(*key)
+        if timing is not None:
+            timing.connect += time.perf_counter() - start
+        return connection, False
+
+    def _connect(self, scheme, host, port):
+        # Return a new connection, tunneled through a proxy if configured.
+        import http.client
+        from urllib.request import proxy_bypass
+
+        proxy = self._proxies.get(scheme, None)
+        if proxy and not proxy_bypass(host):
+            proxyUrl = urlsplit(proxy)
+            proxyHost = proxyUrl.hostname
+            proxyPort = proxyUrl.port
+        else:
+            proxyHost = None
+        if scheme == 'https':
+            if proxyHost:
+                connection = http.client.HTTPSConnection(
+                    proxyHost,
+                    proxyPort,
+                    timeout=self.connectTimeout,
+                    context=self._sslContext,
+                )
+                connection.set_tunnel(host, port)
+            else:
+                connection = http.client.HTTPSConnection(
+                    host,
+                    port,
+                    timeout=self.connectTimeout,
+                    context=self._sslContext,
+                )
+        elif scheme == 'http':
+            if proxyHost:
+                connection = http.client.HTTPConnection(
+                    proxyHost,
+                    proxyPort,
+                    timeout=self.connectTimeout,
+                )
+                connection.set_tunnel(host, port)
+            else:
+                connection = http.client.HTTPConnection(
+                    host,
+                    port,
+                    timeout=self.connectTimeout,
+                )
+        else:
+            raise http.client.HTTPException(f'Unsupported scheme: {scheme}')
+
+        connection.connect()
+        connection.sock.settimeout(self.readTimeout)
+        return connection
+
+    def _release(self, key, connection):
+        # Return the connection to the pool, if there is room.
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.maxIdle:
+                connections.append(connection)
+                return
+
+        connection.close()
+
+    def _request(self, url, headers, timing):
+        # Send one request and read the whole response.
+        # A reused connection closed by the server is replaced once.
+        import http.client
+
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port
+        if port is None:
+            if scheme == 'https':
+                port = 443
+            else:
+                port = 80
+        key = (scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path = f'{path}?{parts.query}'
+        self.rateLimiter.acquire(parts.hostname)
+        while True:
+            connection, reused = self._acquire(key, timing)
+            try:
+                start = time.perf_counter()
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                if timing is not None:
+                    timing.firstByte += time.perf_counter() - start
+                    timing.requests += 1
+                body = response.read()
+                if timing is not None:
+                    timing.bodySize += len(body)
+            except (
+                http.client.RemoteDisconnected,
+                http.client.BadStatusLine,
+                ConnectionResetError,
+                BrokenPipeError,
+            ):
+                connection.close()
+                if reused:
+                    continue
+
+                raise
+
+            except:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            self.rateLimiter.update(
+                parts.hostname,
+                response.status,
+                response.headers,
+            )
+            return response.status, response.headers, body
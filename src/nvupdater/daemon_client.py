@@ -0,0 +1,150 @@
+"""Provide a client for the local update daemon.
+
+The daemon and its clients exchange one line of JSON each way.
+The request lists the repositories to look up:
+
+{"repos": {"novelibre": "https://github.com/peter88213/novelibre", ...}}
+
+The reply has a result for each repository:
+
+{"results": [
+  {"repo": "novelibre", "status": "ok", "releases": [{"version": ...}]},
+  {"repo": "nv_xyz", "status": "failed", "error": "HTTP status 404"},
+  ...
+]}
+
+If the request cannot be processed, the reply is {"error": "..."}.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import os
+import socket
+import time
+
+from nvupdater.lookup_result import LookupResult
+from nvupdater.lookup_timing import LookupTiming
+from nvupdater.version_parser import VersionInfo
+
+MAX_MESSAGE_SIZE = 1048576
+# maximum length in bytes of a request or reply line
+
+
+class DaemonError(Exception):
+    """An error reported by the update daemon."""
+
+
+def result_to_dict(result):
+    """Return a LookupResult instance as a JSON serializable dictionary."""
+    data = dict(repo=result.repoName, status=result.status)
+    if result.data is not None:
+        data['releases'] = [release.as_dict() for release in result.data]
+    if result.error is not None:
+        data['error'] = str(result.error)
+    return data
+
+
+def result_from_dict(data, timing=None):
+    """Return a LookupResult instance for a dictionary made by result_to_dict().
+
+    Optional arguments:
+        timing -- LookupTiming instance to attach to the result.
+
+    Raise ValueError, KeyError, or TypeError if the data is invalid.
+    """
+    status = data['status']
+    if status not in (
+        LookupResult.OK,
+        LookupResult.FAILED,
+        LookupResult.TIMED_OUT,
+        LookupResult.RATE_LIMITED,
+    ):
+        raise ValueError(f'Invalid status: {status}')
+
+    releases = data.get('releases', None)
+    if releases is not None:
+        releases = [VersionInfo.from_dict(release) for release in releases]
+    elif status == LookupResult.OK:
+        raise ValueError('Missing releases')
+
+    error = data.get('error', None)
+    if error is not None:
+        error = DaemonError(error)
+    return LookupResult(
+        data['repo'],
+        status,
+        data=releases,
+        error=error,
+        timing=timing,
+    )
+
+
+class DaemonClient:
+    """Ask the local update daemon for the repositories' version data."""
+
+    def __init__(self, socketPath, timeout=None):
+        """Set the daemon's address.
+
+        Positional arguments:
+            socketPath: str -- path to the daemon's Unix socket.
+
+        Optional arguments:
+            timeout: float -- maximum time in seconds to wait for the reply.
+        """
+        self.socketPath = socketPath
+        if timeout is not None and timeout <= 0:
+            timeout = None
+        self.timeout = timeout
+
+    def is_available(self):
+        """Return True if a daemon may be listening on the socket.
+
+        This is a cheap test for the socket file;
+        a stale socket is only detected by query().
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            return False
+
+        return os.path.exists(self.socketPath)
+
+    def query(self, repoUrls):
+        """Return a list of LookupResult instances.
+
+        Positional arguments:
+            repoUrls: dict -- repository URLs by repository name.
+
+        Each result has a timing record with the time of the whole query.
+        Raise OSError if the daemon cannot be reached,
+        and ValueError if the reply is invalid.
+        """
+        started = time.time()
+        start = time.perf_counter()
+        request = json.dumps(dict(repos=repoUrls)).encode('utf-8')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(self.timeout)
+            s.connect(self.socketPath)
+            s.sendall(request + b'\n')
+            with s.makefile('rb') as f:
+                line = f.readline(MAX_MESSAGE_SIZE)
+        total = time.perf_counter() - start
+        try:
+            reply = json.loads(line.decode('utf-8'))
+            if 'error' in reply:
+                raise DaemonError(reply['error'])
+
+            results = []
+            for data in reply['results']:
+                timing = LookupTiming(
+                    data['repo'],
+                    repoUrls.get(data['repo'], None),
+                )
+                timing.started = started
+                timing.total = total
+                timing.source = LookupTiming.DAEMON
+                results.append(result_from_dict(data, timing=timing))
+        except (KeyError, TypeError, AttributeError, DaemonError) as ex:
+            raise ValueError(f'Invalid reply from the update daemon: {ex}')
+
+        return results
@@ -0,0 +1,88 @@
+"""Provide a class for a lookup diagnostics window.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from tkinter import ttk
+
+from nvupdater.nvupdater_locale import _
+import tkinter as tk
+
+
+class DiagnosticsView(tk.Toplevel):
+    """Show the timing records of a check, slowest lookup first."""
+
+    COLUMNS = (
+        ('Component', 150),
+        ('Total', 70),
+        ('Connect', 70),
+        ('First byte', 70),
+        ('Redirects', 70),
+        ('Bytes', 70),
+        ('Parse', 60),
+        ('Source', 90),
+        ('Outcome', 80),
+    )
+
+    def __init__(self, parent, timings, **kw):
+        """Display the timing records.
+
+        Positional arguments:
+            parent -- the parent window.
+            timings: list -- LookupTiming instances.
+        """
+        super().__init__(parent, **kw)
+        self.title(f'{_("Details")} - {_("Check for updates")}')
+
+        treeWindow = ttk.Frame(self)
+        treeWindow.pack(fill='both', expand=True)
+        columns = [column for column, __ in self.COLUMNS]
+        self._timingList = ttk.Treeview(
+            treeWindow,
+            columns=columns,
+            show='headings',
+            selectmode='browse',
+        )
+        scrollY = ttk.Scrollbar(
+           treeWindow,
+           orient='vertical',
+           command=self._timingList.yview,
+        )
+        self._timingList.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self._timingList.pack(fill='both', expand=True)
+        for column, width in self.COLUMNS:
+            self._timingList.column(
+                column,
+                width=width,
+                minwidth=width,
+                stretch=False,
+            )
+            self._timingList.heading(column, text=_(column), anchor='w')
+
+        ttk.Button(
+            self,
+            text=_('Close'),
+            command=self.destroy,
+        ).pack(padx=5, pady=5, side='right')
+
+        for timing in sorted(timings, key=lambda t: t.total, reverse=True):
+            self._timingList.insert(
+                '',
+                'end',
+                values=(
+                    timing.repoName,
+                    self._ms(timing.total),
+                    self._ms(timing.connect),
+                    self._ms(timing.firstByte),
+                    timing.redirects,
+                    timing.bodySize,
+                    self._ms(timing.parse),
+                    timing.source or '-',
+                    timing.outcome or '-',
+                ),
+            )
+
+    def _ms(self, seconds):
+        return f'{seconds * 1000:.0f} ms'
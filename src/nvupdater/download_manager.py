@@ -0,0 +1,343 @@
+"""Provide a class for downloading update archives in the background.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import queue
+import re
+import threading
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+from nvupdater.connection_pool import ConnectionPool
+
+
+class DownloadProgress:
+    """The state of a download, as posted to the result queue."""
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CORRUPT = 'corrupt'
+
+    def __init__(
+            self,
+            repoName,
+            status,
+            received=0,
+            total=None,
+            filePath=None,
+            verified=False,
+            error=None,
+        ):
+        """Store the state.
+
+        Positional arguments:
+            repoName: str -- name of the component.
+            status: str -- RUNNING, DONE, FAILED, or CORRUPT.
+
+        Optional arguments:
+            received: int -- number of bytes on disk.
+            total: int -- size of the archive, or None if unknown.
+            filePath: str -- path of the completed download.
+            verified: bool -- True if the checksum has been verified.
+            error: Exception -- the reason of a failure.
+        """
+        self.repoName = repoName
+        self.status = status
+        self.received = received
+        self.total = total
+        self.filePath = filePath
+        self.verified = verified
+        self.error = error
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+class DownloadManager:
+    """Download archives concurrently into a staging directory.
+
+    Each archive is streamed to a ".part" file, so an interrupted
+    download is resumed with a HTTP Range request next time.
+    If a SHA-256 checksum is given, the archive is verified
+    before the ".part" file is renamed.
+
+    DownloadProgress instances are posted to a thread-safe queue,
+    so the GUI thread can process them without blocking.
+    A None item marks the end of the downloads.
+    """
+    MAX_WORKERS = 4
+    CHUNK_SIZE = 65536
+    PROGRESS_STEP = 262144
+    # minimum number of bytes between two progress reports
+
+    def __init__(self, stagingDir, maxWorkers=None, timeout=None):
+        """Set the download parameters.
+
+        Positional arguments:
+            stagingDir: str -- directory for the downloaded archives.
+
+        Optional arguments:
+            maxWorkers: int -- maximum number of concurrent downloads.
+            timeout: float -- connect and read timeout in seconds.
+        """
+        self.results = queue.Queue()
+        self.stagingDir = stagingDir
+        if not maxWorkers or maxWorkers < 1:
+            maxWorkers = self.MAX_WORKERS
+        self._maxWorkers = maxWorkers
+        if not timeout or timeout <= 0:
+            timeout = ConnectionPool.READ_TIMEOUT
+        self._timeout = timeout
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def download(self, repoName, url, sha256=None):
+        """Download an archive and return its path.
+
+        Positional arguments:
+            repoName: str -- name of the component.
+            url: str -- download URL.
+
+        Optional arguments:
+            sha256: str -- expected hex SHA-256 checksum.
+
+        Raise ValueError if the checksum does not match;
+        the partial file is removed then, so the next attempt
+        starts from scratch.
+        Raise OSError or urllib.error.URLError on network failure.
+        """
+        import hashlib
+        from urllib.error import HTTPError
+        from urllib.request import Request
+        from urllib.request import urlopen
+
+        os.makedirs(self.stagingDir, exist_ok=True)
+        filePath = f'{self.stagingDir}/{self.get_file_name(url)}'
+        partPath = f'{filePath}.part'
+        if sha256:
+            sha256 = sha256.lower()
+            if os.path.isfile(filePath):
+                if self._hash_file(filePath).hexdigest() == sha256:
+                    size = os.path.getsize(filePath)
+                    self._report(
+                        repoName,
+                        DownloadProgress.RUNNING,
+                        size,
+                        size,
+                    )
+                    return filePath
+
+        hasher = hashlib.sha256()
+        try:
+            received = os.path.getsize(partPath)
+        except OSError:
+            received = 0
+        headers = {'User-Agent': ConnectionPool.USER_AGENT}
+        if received:
+            headers['Range'] = f'bytes={received}-'
+        try:
+            response = urlopen(
+                Request(url, headers=headers),
+                timeout=self._timeout,
+            )
+        except HTTPError as ex:
+            if ex.code != 416 or not received:
+                raise
+
+            # The .part file is complete.
+            ex.close()
+            response = None
+        if response is None:
+            total = received
+            self._hash_file(partPath, hasher)
+        else:
+            with response:
+                if response.status == 206:
+                    total = self._get_total(response, received)
+                    if total is None:
+                        os.remove(partPath)
+                        raise OSError(f'Unexpected Content-Range: {url}')
+
+                    self._hash_file(partPath, hasher)
+                    mode = 'ab'
+                else:
+                    # The server ignores the Range header.
+                    received = 0
+                    mode = 'wb'
+                    total = self._get_total(response, 0)
+                self._receive(
+                    repoName,
+                    response,
+                    partPath,
+                    mode,
+                    received,
+                    total,
+                    hasher,
+                )
+        if sha256 and hasher.hexdigest() != sha256:
+            os.remove(partPath)
+            raise ValueError(f'Checksum mismatch: {url}')
+
+        os.replace(partPath, filePath)
+        return filePath
+
+    def get_file_name(self, url):
+        """Return the archive's file name for a download URL."""
+        fileName = unquote(os.path.basename(urlsplit(url).path))
+        return fileName or 'download'
+
+    def get_results(self, maxItems=None):
+        """Return a list with the progress reports available so far.
+
+        Optional arguments:
+            maxItems: int -- maximum number of reports to return.
+
+        Do not block. The end-of-downloads marker None is included.
+        """
+        items = []
+        while maxItems is None or len(items) < maxItems:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def is_running(self):
+        """Return True if downloads are in progress."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, downloads):
+        """Start downloading in the background.
+
+        Positional arguments:
+            downloads: dict -- (URL, SHA-256 checksum or None) tuples
+                               by component name.
+
+        Do nothing if downloads are already running.
+        """
+        if self.is_running():
+            return
+
+        self._stopped.clear()
+        self.results = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(downloads,),
+            name='nv_updater_download',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the downloads; the partial files are kept for resuming."""
+        self._stopped.set()
+
+    def _download(self, repoName, url, sha256):
+        # Worker thread: download an archive and post the final state.
+        try:
+            filePath = self.download(repoName, url, sha256=sha256)
+        except DownloadCancelled:
+            return
+
+        except ValueError as ex:
+            self._report(repoName, DownloadProgress.CORRUPT, error=ex)
+        except Exception as ex:
+            self._report(repoName, DownloadProgress.FAILED, error=ex)
+        else:
+            size = os.path.getsize(filePath)
+            self._report(
+                repoName,
+                DownloadProgress.DONE,
+                size,
+                size,
+                filePath=filePath,
+                verified=bool(sha256),
+            )
+
+    def _get_total(self, response, offset):
+        # Return the total size of the archive, or None if unknown.
+        contentRange = response.headers.get('Content-Range', '')
+        match = re.match(r'bytes (\d+)-\d+/(\d+)', contentRange)
+        if match is not None:
+            if int(match.group(1)) != offset:
+                return None
+
+            return int(match.group(2))
+
+        length = response.headers.get('Content-Length', None)
+        if length is None or not length.isdigit():
+            return None
+
+        return offset + int(length)
+
+    def _hash_file(self, filePath, hasher=None):
+        # Feed the content of a file to the hasher; return the hasher.
+        import hashlib
+
+        if hasher is None:
+            hasher = hashlib.sha256()
+        with open(filePath, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        return hasher
+
+    def _receive(
+            self,
+            repoName,
+            response,
+            partPath,
+            mode,
+            received,
+            total,
+            hasher,
+        ):
+        # Stream the response body to the .part file.
+        reported = received
+        self._report(repoName, DownloadProgress.RUNNING, received, total)
+        with open(partPath, mode) as f:
+            while True:
+                if self._stopped.is_set():
+                    raise DownloadCancelled()
+
+                chunk = response.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                f.write(chunk)
+                hasher.update(chunk)
+                received += len(chunk)
+                if received - reported >= self.PROGRESS_STEP:
+                    self._report(
+                        repoName,
+                        DownloadProgress.RUNNING,
+                        received,
+                        total,
+                    )
+                    reported = received
+        if total is not None and received != total:
+            raise OSError(f'Incomplete download: {received} of {total} bytes')
+
+    def _report(self, repoName, status, received=0, total=None, **kw):
+        self.results.put(
+            DownloadProgress(repoName, status, received, total, **kw)
+        )
+
+    def _run(self, downloads):
+        # Worker thread: run the downloads concurrently.
+        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures import wait
+
+        executor = ThreadPoolExecutor(max_workers=self._maxWorkers)
+        try:
+            futures = [
+                executor.submit(self._download, repoName, url, sha256)
+                for repoName, (url, sha256) in downloads.items()
+            ]
+            wait(futures)
+        finally:
+            executor.shutdown(wait=False)
+            self.results.put(None)
@@ -0,0 +1,383 @@
+"""Check novelibre installations for updates without a GUI.
+
+Usage:
+python -m nvupdater.headless_checker [--app-dir DIR ...] [--format json|table]
+                                     [--daemon PATH]
+
+The exit code is 1 if updates are available, otherwise 0.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import re
+import sys
+
+from nvupdater.connection_pool import ConnectionPool
+from nvupdater.daemon_client import DaemonClient
+from nvupdater.lookup_engine import LookupEngine
+from nvupdater.lookup_result import LookupResult
+from nvupdater.nvupdater_globals import HOME_DIR
+from nvupdater.nvupdater_globals import NOVELIBRE_URL
+from nvupdater.rate_limiter import RateLimiter
+from nvupdater.remote_data import RemoteData
+from nvupdater.semantic_version import Version
+from nvupdater.semantic_version import update_available
+from nvupdater.update_resolver import plan_updates
+from nvupdater.version_cache import VersionCache
+from nvupdater.version_index import VersionIndex
+from nvupdater.version_mirror import VersionMirror
+
+OUTDATED = 'outdated'
+CURRENT = 'current'
+UNKNOWN = 'unknown'
+TIMED_OUT = 'timed out'
+RATE_LIMITED = 'rate limited'
+INCOMPATIBLE = 'incompatible'
+
+
+def get_class_attributes(filePath, className='Plugin'):
+    """Return a dictionary with the constant class attributes of a module.
+
+    Positional arguments:
+        filePath: str -- path to the Python module.
+
+    Optional arguments:
+        className: str -- name of the class to inspect.
+
+    The module is parsed, not imported.
+    Only attributes with literal values are returned.
+    """
+    with open(filePath, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=filePath)
+    attributes = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef) or node.name != className:
+            continue
+
+        for item in node.body:
+            if not isinstance(item, ast.Assign):
+                continue
+
+            try:
+                value = ast.literal_eval(item.value)
+            except ValueError:
+                continue
+
+            for target in item.targets:
+                if isinstance(target, ast.Name):
+                    attributes[target.id] = value
+    return attributes
+
+
+def get_novelibre_version(applicationDir):
+    """Return the version string of the installed novelibre, or None.
+
+    Positional arguments:
+        applicationDir: str -- path to the novelibre application directory.
+    """
+    try:
+        with open(
+            f'{applicationDir}/novelibre.py',
+            'r',
+            encoding='utf-8',
+        ) as f:
+            text = f.read()
+    except OSError:
+        return None
+
+    match = re.search(
+        r'''^(?:__version__|VERSION)\s*=\s*['"](\d+\.\d+\.\d+)['"]''',
+        text,
+        flags=re.MULTILINE,
+    )
+    if match is None:
+        match = re.search(r'Version (\d+\.\d+\.\d+)', text)
+    if match is None:
+        return None
+
+    return match.group(1)
+
+
+def get_plugins(applicationDir):
+    """Return a dictionary with (VERSION, URL) tuples by plugin name.
+
+    Positional arguments:
+        applicationDir: str -- path to the novelibre application directory.
+
+    The plugin modules are parsed, not imported,
+    so novelibre does not need to be importable.
+    """
+    plugins = {}
+    for filePath in sorted(glob.glob(f'{applicationDir}/plugin/*.py')):
+        pluginName = os.path.splitext(os.path.basename(filePath))[0]
+        try:
+            attributes = get_class_attributes(filePath)
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            continue
+
+        if not attributes:
+            continue
+
+        plugins[pluginName] = (
+            attributes.get('VERSION', None),
+            attributes.get('URL', None),
+        )
+    return plugins
+
+
+def check_installation(
+        applicationDir,
+        lookupEngine,
+        novelibreVersion=None,
+        beta=False,
+        daemonClient=None,
+    ):
+    """Return a list of dictionaries describing each component's state.
+
+    Positional arguments:
+        applicationDir: str -- path to the novelibre application directory.
+        lookupEngine -- LookupEngine instance.
+
+    Optional arguments:
+        novelibreVersion: str -- installed novelibre version;
+                                 if None, it is read from the installation.
+        beta: bool -- if True, pre-releases are offered as updates.
+        daemonClient -- DaemonClient instance; if the update daemon
+                        can be reached, it does the lookups.
+    """
+    if novelibreVersion is None:
+        novelibreVersion = get_novelibre_version(applicationDir)
+    installed = {'novelibre': novelibreVersion}
+    repoUrls = {'novelibre': NOVELIBRE_URL}
+    plugins = get_plugins(applicationDir)
+    for pluginName in plugins:
+        installed[pluginName], repoUrls[pluginName] = plugins[pluginName]
+
+    lookupResults = None
+    if daemonClient is not None and daemonClient.is_available():
+        try:
+            lookupResults = daemonClient.query(repoUrls)
+        except (OSError, ValueError):
+            pass
+            # falling back to the direct lookup
+    if lookupResults is None:
+        lookupResults = lookupEngine.run(repoUrls)
+    results = {}
+    releases = {}
+    for result in lookupResults:
+        results[result.repoName] = result
+        if result.status == LookupResult.OK:
+            releases[result.repoName] = result.data
+    currentVersions = {
+        repoName: Version.from_string(installed[repoName])
+        for repoName in repoUrls
+    }
+    plan = plan_updates(releases, currentVersions, beta=beta)
+
+    rows = []
+    for repoName in repoUrls:
+        row = dict(
+            component=repoName,
+            installed=installed[repoName],
+            latest=None,
+            status=UNKNOWN,
+            download_link=None,
+            needs_novelibre_update=False,
+        )
+        result = results.get(repoName, None)
+        if result is None:
+            pass
+        elif result.status == LookupResult.TIMED_OUT:
+            row['status'] = TIMED_OUT
+        elif result.status == LookupResult.RATE_LIMITED:
+            row['status'] = RATE_LIMITED
+        elif result.status == LookupResult.OK:
+            resolution = plan[repoName]
+            if resolution.update is not None:
+                row['latest'] = str(resolution.update.version)
+                row['status'] = OUTDATED
+                row['download_link'] = resolution.update.downloadLink
+                row['needs_novelibre_update'] = resolution.needsNovelibre
+            elif resolution.latest is None:
+                row['status'] = CURRENT
+            else:
+                row['latest'] = str(resolution.latest.version)
+                if update_available(
+                    resolution.latest.version,
+                    currentVersions[repoName],
+                    beta=beta,
+                ):
+                    # The newest release needs a newer novelibre.
+                    row['status'] = INCOMPATIBLE
+                else:
+                    row['status'] = CURRENT
+        rows.append(row)
+    return rows
+
+
+def format_table(reports):
+    """Return the reports as a plain text table.
+
+    Positional arguments:
+        reports: list -- dictionaries with 'installation' and 'components'.
+    """
+    header = ('Component', 'Installed', 'Latest', 'Status')
+    lines = []
+    for report in reports:
+        table = [header]
+        for row in report['components']:
+            table.append((
+                row['component'],
+                row['installed'] or '-',
+                row['latest'] or '-',
+                row['status'],
+            ))
+        widths = [max(len(line[i]) for line in table) for i in range(len(header))]
+        lines.append(f"# {report['installation']}")
+        for line in table:
+            lines.append('  '.join(
+                value.ljust(widths[i]) for i, value in enumerate(line)
+            ).rstrip())
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Run the check; return 1 if updates are available, otherwise 0."""
+    parser = argparse.ArgumentParser(
+        description='Check novelibre installations for updates.',
+    )
+    parser.add_argument(
+        '--app-dir',
+        action='append',
+        dest='applicationDirs',
+        metavar='DIR',
+        help='novelibre application directory (default: ~/.novx); '
+        'can be given several times.',
+    )
+    parser.add_argument(
+        '--format',
+        choices=('json', 'table'),
+        default='table',
+        help='output format (default: table).',
+    )
+    parser.add_argument(
+        '--novelibre-version',
+        dest='novelibreVersion',
+        metavar='X.Y.Z',
+        help='installed novelibre version, if it cannot be detected.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='maximum number of concurrent lookups.',
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='overall deadline of a check in seconds.',
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=None,
+        help='maximum number of requests per second and host.',
+    )
+    parser.add_argument(
+        '--index',
+        metavar='LOCATION',
+        help='URL or path of an aggregated version index.',
+    )
+    parser.add_argument(
+        '--mirror',
+        metavar='DIR',
+        help='read the VERSION files from a local mirror, '
+        'without network access.',
+    )
+    parser.add_argument(
+        '--beta',
+        action='store_true',
+        help='offer pre-releases from the [BETA] section as updates.',
+    )
+    parser.add_argument(
+        '--daemon',
+        metavar='PATH',
+        help='socket path of the update daemon; if it is not running, '
+        'the repositories are looked up directly.',
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        dest='noCache',
+        help='do not use the version cache.',
+    )
+    args = parser.parse_args(argv)
+    applicationDirs = args.applicationDirs or [f'{HOME_DIR}/.novx']
+
+    reports = []
+    found = False
+    connectionPool = ConnectionPool(rateLimiter=RateLimiter(rate=args.rate))
+    if args.index:
+        versionIndex = VersionIndex(args.index, connectionPool=connectionPool)
+    else:
+        versionIndex = None
+    if args.mirror:
+        mirror = VersionMirror(args.mirror)
+    else:
+        mirror = None
+    if args.daemon:
+        daemonClient = DaemonClient(args.daemon, timeout=args.timeout)
+    else:
+        daemonClient = None
+    for applicationDir in applicationDirs:
+        if args.noCache:
+            cache = None
+        else:
+            cache = VersionCache(
+                f'{applicationDir}/cache/nv_updater_versions.json'
+            )
+        remoteData = RemoteData(
+            cache=cache,
+            connectionPool=connectionPool,
+            versionIndex=versionIndex,
+            mirror=mirror,
+        )
+        lookupEngine = LookupEngine(
+            remoteData.get_remote_data,
+            maxWorkers=args.workers,
+            timeout=args.timeout,
+        )
+        rows = check_installation(
+            applicationDir,
+            lookupEngine,
+            novelibreVersion=args.novelibreVersion,
+            beta=args.beta,
+            daemonClient=daemonClient,
+        )
+        if cache is not None:
+            cache.write()
+        if any(row['status'] == OUTDATED for row in rows):
+            found = True
+        reports.append(dict(installation=applicationDir, components=rows))
+    connectionPool.close()
+
+    if args.format == 'json':
+        print(json.dumps(reports, indent=2))
+    else:
+        print(format_table(reports))
+    if found:
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
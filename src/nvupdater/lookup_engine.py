@@ -0,0 +1,140 @@
+"""Provide a class for concurrent remote version lookups.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import threading
+import time
+
+from nvupdater.lookup_result import LookupResult
+from nvupdater.lookup_timing import LookupTiming
+
+
+class LookupEngine:
+    """Fetch the VERSION files of many repositories on a bounded thread pool.
+    
+    All lookups are submitted at once, so the total time of a check
+    is close to the slowest single lookup instead of the sum of all.
+    An optional deadline limits the duration of the whole check.
+    """
+    MAX_WORKERS = 8
+
+    def __init__(self, lookup, maxWorkers=None, timeout=None):
+        """Set the lookup function and the size of the worker pool.
+        
+        Positional arguments:
+            lookup -- callable taking a repository URL and a LookupTiming
+                      instance, returning the repository's version data.
+        
+        Optional arguments:
+            maxWorkers: int -- maximum number of concurrent lookups.
+            timeout: float -- overall deadline of a check in seconds.
+        """
+        if not maxWorkers or maxWorkers < 1:
+            maxWorkers = self.MAX_WORKERS
+        self.maxWorkers = maxWorkers
+        if timeout is not None and timeout <= 0:
+            timeout = None
+        self.timeout = timeout
+        self._lookup = lookup
+        self._executor = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Cancel all lookups that have not started yet.
+        
+        Lookups already in progress are finished,
+        but their results are discarded.
+        """
+        with self._lock:
+            for future in self._futures:
+                future.cancel()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def run(self, repoUrls):
+        """Generator yielding LookupResult instances as lookups complete.
+        
+        Positional arguments:
+            repoUrls: dict -- repository URLs by repository name.
+        
+        When the deadline has passed, all outstanding lookups
+        are yielded as timed out.
+        Cancelled lookups are not yielded.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures import TimeoutError as FuturesTimeoutError
+        from concurrent.futures import as_completed
+
+        if self.timeout is None:
+            deadline = None
+        else:
+            deadline = time.monotonic() + self.timeout
+        with self._lock:
+            self._executor = ThreadPoolExecutor(
+                max_workers=min(self.maxWorkers, max(len(repoUrls), 1)),
+                thread_name_prefix='nv_updater',
+            )
+            self._futures = {}
+            for repoName in repoUrls:
+                timing = LookupTiming(repoName, repoUrls[repoName])
+                future = self._executor.submit(
+                    self._timed_lookup,
+                    repoUrls[repoName],
+                    timing,
+                )
+                future.timing = timing
+                self._futures[future] = repoName
+            futures = dict(self._futures)
+        pending = set(futures)
+        try:
+            if deadline is None:
+                remaining = None
+            else:
+                remaining = max(deadline - time.monotonic(), 0)
+            try:
+                for future in as_completed(futures, timeout=remaining):
+                    pending.discard(future)
+                    if future.cancelled():
+                        continue
+
+                    repoName = futures[future]
+                    try:
+                        data = future.result()
+                    except Exception as ex:
+                        yield LookupResult.from_error(
+                            repoName,
+                            ex,
+                            timing=future.timing,
+                        )
+                    else:
+                        yield LookupResult(
+                            repoName,
+                            LookupResult.OK,
+                            data=data,
+                            timing=future.timing,
+                        )
+            except FuturesTimeoutError:
+                for future in pending:
+                    future.cancel()
+                for future in pending:
+                    future.timing.stop()
+                    yield LookupResult(
+                        futures[future],
+                        LookupResult.TIMED_OUT,
+                        timing=future.timing,
+                    )
+        finally:
+            self.cancel()
+
+    def _timed_lookup(self, repoUrl, timing):
+        # Worker thread: run the lookup function and record the time.
+        timing.start()
+        try:
+            return self._lookup(repoUrl, timing)
+
+        finally:
+            timing.stop()
@@ -0,0 +1,48 @@
+"""Provide a class for the result of a remote version lookup.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import socket
+
+from nvupdater.rate_limiter import RateLimitExceeded
+
+
+class LookupResult:
+    """Outcome of a single repository lookup."""
+    OK = 'ok'
+    FAILED = 'failed'
+    TIMED_OUT = 'timed out'
+    RATE_LIMITED = 'rate limited'
+
+    def __init__(self, repoName, status, data=None, error=None, timing=None):
+        """Store the lookup outcome.
+        
+        Positional arguments:
+            repoName: str -- name of the looked up repository.
+            status: str -- one of OK, FAILED, TIMED_OUT, RATE_LIMITED.
+        
+        Optional arguments:
+            data -- version data returned by the lookup function.
+            error -- exception raised by the lookup function, if any.
+            timing -- LookupTiming instance, if recorded.
+        """
+        self.repoName = repoName
+        self.status = status
+        self.data = data
+        self.error = error
+        self.timing = timing
+        if timing is not None:
+            timing.outcome = status
+
+    @classmethod
+    def from_error(cls, repoName, error, timing=None):
+        """Return a failed, timed out, or rate limited result."""
+        if isinstance(error, socket.timeout):
+            status = cls.TIMED_OUT
+        elif isinstance(error, RateLimitExceeded):
+            status = cls.RATE_LIMITED
+        else:
+            status = cls.FAILED
+        return cls(repoName, status, error=error, timing=timing)
@@ -0,0 +1,73 @@
+"""Provide a class for the timing record of a remote version lookup.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import time
+
+
+class LookupTiming:
+    """Timings and transfer figures of a single repository lookup.
+    
+    All durations are in seconds and accumulate over retries
+    and redirects.
+    """
+    CACHE = 'cache'
+    DAEMON = 'daemon'
+    INDEX = 'index'
+    MIRROR = 'mirror'
+    REVALIDATED = 'revalidated'
+    NETWORK = 'network'
+
+    def __init__(self, repoName, repoUrl):
+        """Initialize the record.
+        
+        Positional arguments:
+            repoName: str -- name of the looked up repository.
+            repoUrl: str -- URL of the looked up repository.
+        """
+        self.repoName = repoName
+        self.repoUrl = repoUrl
+        self.started = None
+        self.connect = 0.0
+        # DNS lookup and TCP/TLS connection setup
+        self.firstByte = 0.0
+        # time from sending a request to receiving the response header
+        self.redirects = 0
+        self.requests = 0
+        self.bodySize = 0
+        self.parse = 0.0
+        self.total = 0.0
+        self.source = None
+        # CACHE, DAEMON, INDEX, MIRROR, REVALIDATED, or NETWORK
+        self.outcome = None
+        # the LookupResult status
+        self._start = None
+
+    def as_dict(self):
+        """Return the record as a JSON serializable dictionary."""
+        return dict(
+            repo=self.repoName,
+            url=self.repoUrl,
+            started=self.started,
+            connect=self.connect,
+            first_byte=self.firstByte,
+            redirects=self.redirects,
+            requests=self.requests,
+            body_size=self.bodySize,
+            parse=self.parse,
+            total=self.total,
+            source=self.source,
+            outcome=self.outcome,
+        )
+
+    def start(self):
+        """Start the timing."""
+        self.started = time.time()
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """Stop the timing, if started."""
+        if self._start is not None:
+            self.total = time.perf_counter() - self._start
@@ -0,0 +1,121 @@
+"""Refresh a local mirror of the repositories' VERSION files.
+
+Usage:
+python -m nvupdater.mirror_sync --mirror DIR [--app-dir DIR ...]
+
+The mirrored repositories, novelibre, and the plugins of the given
+novelibre installations are refreshed.
+The exit code is 1 if any repository could not be refreshed, otherwise 0.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import sys
+
+from nvupdater.headless_checker import get_plugins
+from nvupdater.lookup_engine import LookupEngine
+from nvupdater.lookup_result import LookupResult
+from nvupdater.nvupdater_globals import NOVELIBRE_URL
+from nvupdater.remote_data import RemoteData
+from nvupdater.version_mirror import VersionMirror
+
+
+def sync_mirror(mirror, repoUrls, maxWorkers=None, timeout=None):
+    """Download the VERSION files into the mirror.
+
+    Positional arguments:
+        mirror -- VersionMirror instance.
+        repoUrls: dict -- repository URLs by repository name.
+
+    Optional arguments:
+        maxWorkers: int -- maximum number of concurrent downloads.
+        timeout: float -- overall deadline in seconds.
+
+    Return a list of LookupResult instances.
+    A mirrored file is replaced only if the download succeeded.
+    """
+    remoteData = RemoteData()
+
+    def download(repoUrl, timing):
+        versionInfo = remoteData.get_version_info(repoUrl, timing=timing)
+        mirror.write(repoUrl, versionInfo)
+
+    lookupEngine = LookupEngine(
+        download,
+        maxWorkers=maxWorkers,
+        timeout=timeout,
+    )
+    try:
+        return list(lookupEngine.run(repoUrls))
+
+    finally:
+        remoteData.close()
+
+
+def main(argv=None):
+    """Run the synchronization; return 1 on errors, otherwise 0."""
+    parser = argparse.ArgumentParser(
+        description='Refresh a local mirror of VERSION files.',
+    )
+    parser.add_argument(
+        '--mirror',
+        required=True,
+        metavar='DIR',
+        help='root directory or file:// URL of the mirror.',
+    )
+    parser.add_argument(
+        '--app-dir',
+        action='append',
+        default=[],
+        dest='applicationDirs',
+        metavar='DIR',
+        help='novelibre application directory whose plugins are added; '
+        'can be given several times.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='maximum number of concurrent downloads.',
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='overall deadline in seconds.',
+    )
+    args = parser.parse_args(argv)
+
+    mirror = VersionMirror(args.mirror)
+    repoUrls = {'novelibre': NOVELIBRE_URL}
+    for repoUrl in mirror.get_repositories():
+        repoUrls.setdefault(repoUrl.rsplit('/', 1)[-1], repoUrl)
+    for applicationDir in args.applicationDirs:
+        plugins = get_plugins(applicationDir)
+        for pluginName in plugins:
+            __, repoUrl = plugins[pluginName]
+            if repoUrl:
+                repoUrls[pluginName] = repoUrl
+
+    failed = 0
+    for result in sync_mirror(
+        mirror,
+        repoUrls,
+        maxWorkers=args.workers,
+        timeout=args.timeout,
+    ):
+        if result.status == LookupResult.OK:
+            print(f'{result.repoName}: ok')
+        else:
+            failed += 1
+            print(f'{result.repoName}: {result.status} ({result.error})')
+    if failed:
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
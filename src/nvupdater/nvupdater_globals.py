@@ -1,9 +1,19 @@
-"""Provide a global constant.
+"""Provide global constants.
 
 Copyright (c) 2025 Peter Triesberger
 For further information see https://github.com/peter88213/nv_updater
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
+from pathlib import Path
 
 HELP_PAGE = 'nv_updater'
+NOVELIBRE_URL = 'https://github.com/peter88213/novelibre'
 
+try:
+    HOME_DIR = str(Path.home()).replace('\\', '/')
+except:
+    HOME_DIR = '.'
+CACHE_DIR = f'{HOME_DIR}/.novx/cache'
+VERSION_CACHE = f'{CACHE_DIR}/nv_updater_versions.json'
+DOWNLOAD_DIR = f'{CACHE_DIR}/nv_updater_downloads'
+CHECK_SNAPSHOT = f'{CACHE_DIR}/nv_updater_snapshot.json'
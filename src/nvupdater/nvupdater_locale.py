@@ -1,30 +1,101 @@
 """Locale settings for nv_updater.
 
+The translation is loaded on the first call of _(), not at import time.
+Without a matching catalog, messages are returned untranslated.
+
+The detected language and the loaded catalogs are kept in a
+dictionary that is shared by all plugins using this module,
+so locale discovery and .mo file parsing are done once per session.
+Since every plugin is built with its own copy of this module,
+the dictionary is attached to the gettext module, which all copies have
+in common.
+
 Copyright (c) 2025 Peter Triesberger
 For further information see https://github.com/peter88213/nv_updater
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
-import gettext
-import locale
 import os
 import sys
 
-# Initialize localization.
+DOMAIN = 'nv_updater'
 LOCALE_PATH = f'{os.path.dirname(sys.argv[0])}/locale/'
-try:
-    CURRENT_LANGUAGE = locale.getlocale()[0][:2]
-except:
-    # Fallback for old Windows versions.
-    CURRENT_LANGUAGE = locale.getdefaultlocale()[0][:2]
-try:
-    t = gettext.translation(
-        'nv_updater',
-        LOCALE_PATH,
-        languages=[CURRENT_LANGUAGE],
-    )
-    _ = t.gettext
-except:
-
-    def _(message):
-        return message
+CACHE_ATTRIBUTE = 'novelibre_catalog_cache'
+# name of the shared catalog cache attribute of the gettext module
+
+_gettext = None
+# the translation function, once loaded
+
+
+def _(message):
+    """Return the translation of message."""
+    global _gettext
+
+    if _gettext is None:
+        _gettext = get_translation(DOMAIN, LOCALE_PATH).gettext
+    return _gettext(message)
+
+
+def get_catalog_cache():
+    """Return the catalog cache dictionary shared by all plugins.
+
+    The keys are 'language' for the detected language code,
+    and (domain, locale directory, language) tuples for the
+    gettext translation instances.
+    """
+    import gettext
+
+    cache = getattr(gettext, CACHE_ATTRIBUTE, None)
+    if cache is None:
+        cache = {}
+        setattr(gettext, CACHE_ATTRIBUTE, cache)
+    return cache
+
+
+def get_language():
+    """Return the two-letter code of the current language, or None."""
+    cache = get_catalog_cache()
+    if 'language' not in cache:
+        import locale
+
+        try:
+            language = locale.getlocale()[0][:2]
+        except:
+            try:
+                # Fallback for old Windows versions.
+                language = locale.getdefaultlocale()[0][:2]
+            except:
+                language = None
+        cache['language'] = language
+    return cache['language']
+
+
+def get_translation(domain, localeDir):
+    """Return a gettext translation instance for the current language.
+
+    Positional arguments:
+        domain: str -- the message catalog's domain.
+        localeDir: str -- the directory containing the catalogs.
+
+    If there is no catalog, a NullTranslations instance is returned.
+    """
+    import gettext
 
+    cache = get_catalog_cache()
+    language = get_language()
+    key = (domain, os.path.abspath(localeDir), language)
+    translation = cache.get(key, None)
+    if translation is None:
+        if language is None:
+            translation = gettext.NullTranslations()
+        else:
+            try:
+                translation = gettext.translation(
+                    domain,
+                    localeDir,
+                    languages=[language],
+                    fallback=True,
+                )
+            except OSError:
+                translation = gettext.NullTranslations()
+        cache[key] = translation
+    return translation
@@ -0,0 +1,205 @@
+"""Provide a class for installing plugin packages without setup scripts.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import os
+import zlib
+
+from nvupdater.package_manifest import TREES
+from nvupdater.package_manifest import get_package_files
+from nvupdater.package_manifest import read_manifest
+
+
+class PackageInstaller:
+    """Install plugin packages from their distribution archives.
+
+    The archives are the .zip or .pyz files built for the plugins'
+    setup scripts. Like setuplib.install(), the installer copies
+    the plugin module to the plugin directory, and the locale and
+    icons trees to the application directory.
+
+    Each archive is opened once, and its entries are streamed
+    into place. Every file is written to a temporary file first,
+    which then replaces the target atomically.
+
+    If the archive has a content manifest, it is compared with the
+    manifest stored when the package was installed before. Then only
+    changed files are written, and files no longer in the package
+    are removed. Otherwise, files with the same size and CRC-32
+    as the archive entry are not written.
+    """
+    CHUNK_SIZE = 65536
+
+    def __init__(self, applicationDir):
+        """Set the installation target.
+
+        Positional arguments:
+            applicationDir: str -- path to the novelibre application directory.
+        """
+        self.applicationDir = applicationDir
+        self.manifestDir = f'{applicationDir}/cache/nv_updater_manifests'
+
+    def install(self, archivePath):
+        """Install a plugin package and return a tuple of file counts.
+
+        Positional arguments:
+            archivePath: str -- path to the package archive.
+
+        The tuple holds the numbers of files (written, unchanged, removed).
+        Raise ValueError if the archive is not a plugin package.
+        Raise OSError or zipfile.BadZipFile on failure.
+        """
+        import zipfile
+
+        written = 0
+        unchanged = 0
+        removed = 0
+        with zipfile.ZipFile(archivePath) as z:
+            files = get_package_files(z)
+            pluginName = os.path.basename(files[0][1])
+            manifest = read_manifest(z)
+            installed = self._read_installed_manifest(pluginName)
+            if manifest is None or installed is None:
+                installedFiles = {}
+            else:
+                installedFiles = installed['files']
+            for entry, filePath in files:
+                targetPath = f'{self.applicationDir}/{filePath}'
+                if filePath in installedFiles:
+                    isUnchanged = self._is_listed_unchanged(
+                        targetPath,
+                        manifest['files'].get(filePath, None),
+                        installedFiles[filePath],
+                    )
+                else:
+                    isUnchanged = self._is_unchanged(entry, targetPath)
+                if isUnchanged:
+                    unchanged += 1
+                    continue
+
+                self._extract(z, entry, targetPath)
+                written += 1
+        if manifest is None:
+            # A previously stored manifest no longer describes the files.
+            self._remove_file(self._get_manifest_path(pluginName))
+            return written, unchanged, removed
+
+        for filePath in installedFiles:
+            if filePath in manifest['files']:
+                continue
+
+            if not self._is_package_path(filePath):
+                continue
+
+            if self._remove_file(f'{self.applicationDir}/{filePath}'):
+                removed += 1
+        self._write_installed_manifest(pluginName, manifest)
+        return written, unchanged, removed
+
+    def install_all(self, archivePaths):
+        """Install many plugin packages; return a dictionary of results.
+
+        Positional arguments:
+            archivePaths: dict -- archive paths by component name.
+
+        The results are (written, unchanged, removed) tuples,
+        or the exception that made the installation fail.
+        """
+        import zipfile
+
+        results = {}
+        for repoName, archivePath in archivePaths.items():
+            try:
+                results[repoName] = self.install(archivePath)
+            except (ValueError, OSError, zipfile.BadZipFile) as ex:
+                results[repoName] = ex
+        return results
+
+    def _extract(self, z, entry, targetPath):
+        # Stream the entry to a temporary file and replace the target.
+        os.makedirs(os.path.dirname(targetPath), exist_ok=True)
+        tempPath = f'{targetPath}.tmp'
+        try:
+            with z.open(entry) as source, open(tempPath, 'wb') as f:
+                for chunk in iter(lambda: source.read(self.CHUNK_SIZE), b''):
+                    f.write(chunk)
+            os.replace(tempPath, targetPath)
+        except:
+            if os.path.isfile(tempPath):
+                os.remove(tempPath)
+            raise
+
+    def _get_manifest_path(self, pluginName):
+        return f'{self.manifestDir}/{os.path.splitext(pluginName)[0]}.json'
+
+    def _is_listed_unchanged(self, targetPath, new, old):
+        # Return True if both manifests list the same content,
+        # and the installed file has the listed size.
+        if new is None or new != old:
+            return False
+
+        try:
+            return os.path.getsize(targetPath) == new['size']
+
+        except (OSError, KeyError, TypeError):
+            return False
+
+    def _is_package_path(self, filePath):
+        # Return True if the installer may remove the file.
+        if '..' in filePath.split('/') or filePath.startswith('/'):
+            return False
+
+        return filePath.startswith(TREES + ('plugin/',))
+
+    def _is_unchanged(self, entry, targetPath):
+        # Return True if the target file has the entry's size and CRC-32.
+        try:
+            if os.path.getsize(targetPath) != entry.file_size:
+                return False
+
+            crc = 0
+            with open(targetPath, 'rb') as f:
+                for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b''):
+                    crc = zlib.crc32(chunk, crc)
+        except OSError:
+            return False
+
+        return crc == entry.CRC
+
+    def _read_installed_manifest(self, pluginName):
+        # Return the manifest stored at the last installation, or None.
+        try:
+            with open(
+                self._get_manifest_path(pluginName),
+                'r',
+                encoding='utf-8',
+            ) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(manifest, dict) or 'files' not in manifest:
+            return None
+
+        return manifest
+
+    def _remove_file(self, filePath):
+        # Remove a file; return True on success.
+        try:
+            os.remove(filePath)
+        except OSError:
+            return False
+
+        return True
+
+    def _write_installed_manifest(self, pluginName, manifest):
+        # Store the package's manifest; the file is replaced atomically.
+        filePath = self._get_manifest_path(pluginName)
+        os.makedirs(self.manifestDir, exist_ok=True)
+        tempPath = f'{filePath}.tmp'
+        with open(tempPath, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tempPath, filePath)
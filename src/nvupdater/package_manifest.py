@@ -0,0 +1,138 @@
+"""Provide functions for the content manifests of plugin packages.
+
+A manifest lists the files a package installs, with their paths
+relative to the novelibre application directory, sizes,
+and SHA-256 checksums:
+
+{
+  "plugin": "nv_updater.py",
+  "files": {
+    "plugin/nv_updater.py": {"size": 20436, "sha256": "..."},
+    "locale/de/LC_MESSAGES/nv_updater.mo": {"size": 1294, "sha256": "..."}
+  }
+}
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import re
+
+MANIFEST = 'manifest.json'
+# name of the manifest in the package archive
+TREES = ('locale/', 'icons/')
+SETUP_FILES = ('setuplib.py', 'setup.py', '__main__.py')
+CHUNK_SIZE = 65536
+
+
+def get_plugin_name(z):
+    """Return the file name of the plugin module in a package archive.
+
+    Positional arguments:
+        z -- zipfile.ZipFile instance of the package archive.
+
+    Raise ValueError if the archive is not a plugin package.
+    """
+    names = z.namelist()
+    if 'setuplib.py' in names:
+        setupLib = z.read('setuplib.py').decode('utf-8', errors='replace')
+        match = re.search(
+            r'''^PLUGIN\s*=\s*['"]([^'"/\\]+\.py)['"]''',
+            setupLib,
+            flags=re.MULTILINE,
+        )
+        if match is not None and match.group(1) in names:
+            return match.group(1)
+
+    modules = [
+        name for name in names
+        if name.endswith('.py')
+        and '/' not in name
+        and name not in SETUP_FILES
+    ]
+    if len(modules) != 1:
+        raise ValueError('Not a plugin package')
+
+    return modules[0]
+
+
+def get_package_files(z):
+    """Return a list of (ZipInfo, target path) tuples for a package archive.
+
+    Positional arguments:
+        z -- zipfile.ZipFile instance of the package archive.
+
+    The target paths are relative to the novelibre application directory.
+    Raise ValueError if the archive is not a plugin package,
+    or if an entry would be installed outside the application directory.
+    """
+    pluginName = get_plugin_name(z)
+    files = [(z.getinfo(pluginName), f'plugin/{pluginName}')]
+    for entry in z.infolist():
+        name = entry.filename
+        if entry.is_dir() or not name.startswith(TREES):
+            continue
+
+        if '..' in name.split('/') or name.startswith('/'):
+            raise ValueError(f'Invalid entry: {name}')
+
+        files.append((entry, name))
+    return files
+
+
+def create_manifest(z):
+    """Return the manifest of a package archive as a dictionary.
+
+    Positional arguments:
+        z -- zipfile.ZipFile instance of the package archive.
+    """
+    import hashlib
+
+    files = {}
+    for entry, targetPath in get_package_files(z):
+        hasher = hashlib.sha256()
+        with z.open(entry) as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        files[targetPath] = dict(
+            size=entry.file_size,
+            sha256=hasher.hexdigest(),
+        )
+    return dict(plugin=get_plugin_name(z), files=files)
+
+
+def read_manifest(z):
+    """Return the manifest stored in a package archive, or None.
+
+    Positional arguments:
+        z -- zipfile.ZipFile instance of the package archive.
+    """
+    try:
+        manifest = json.loads(z.read(MANIFEST).decode('utf-8'))
+    except (KeyError, ValueError):
+        return None
+
+    if not isinstance(manifest, dict) or 'files' not in manifest:
+        return None
+
+    return manifest
+
+
+def add_manifest(archivePath):
+    """Add a manifest to a freshly built package archive.
+
+    Positional arguments:
+        archivePath: str -- path to the package archive.
+
+    Raise ValueError if the archive already has a manifest.
+    """
+    import zipfile
+
+    with zipfile.ZipFile(archivePath) as z:
+        if MANIFEST in z.namelist():
+            raise ValueError(f'"{archivePath}" already has a manifest')
+
+        manifest = create_manifest(z)
+    with zipfile.ZipFile(archivePath, 'a', zipfile.ZIP_DEFLATED) as z:
+        z.writestr(MANIFEST, json.dumps(manifest, indent=1))
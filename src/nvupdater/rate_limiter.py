@@ -0,0 +1,259 @@
+"""Provide a per-host rate limiter for the version lookups.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import threading
+import time
+
+
+class RateLimitExceeded(Exception):
+    """The request quota of a host is exhausted."""
+
+    def __init__(self, host, retryAt=None):
+        """Store the host and the time when requests are accepted again.
+
+        Positional arguments:
+            host: str -- the host name.
+
+        Optional arguments:
+            retryAt: float -- epoch time of the quota reset, if known.
+        """
+        self.host = host
+        self.retryAt = retryAt
+        if retryAt is None:
+            message = f'Rate limit of {host} exceeded'
+        else:
+            retryTime = time.strftime('%H:%M:%S', time.localtime(retryAt))
+            message = f'Rate limit of {host} exceeded until {retryTime}'
+        super().__init__(message)
+
+
+def get_rate_limit_error(host, status, headers):
+    """Return a RateLimitExceeded instance for a refused request, or None.
+
+    Positional arguments:
+        host: str -- the host name.
+        status: int -- HTTP status code of the response.
+        headers -- the response headers.
+
+    "429 Too many requests" is always a rate limit error.
+    "403 Forbidden" is one if the rate limit headers say
+    that no requests are left, as with GitHub.
+    """
+    retryAfter = parse_retry_after(headers.get('Retry-After', None))
+    remaining, reset = parse_quota(headers)
+    if status == 403:
+        isLimited = remaining == 0 or retryAfter is not None
+    else:
+        isLimited = status == 429
+    if isLimited:
+        if retryAfter is not None:
+            return RateLimitExceeded(host, time.time() + retryAfter)
+
+        return RateLimitExceeded(host, reset)
+
+    return None
+
+
+def parse_quota(headers):
+    """Return a tuple (remaining requests, epoch time of the reset).
+
+    Positional arguments:
+        headers -- the response headers.
+
+    The values are read from the X-RateLimit-Remaining and
+    X-RateLimit-Reset headers; missing or invalid values are None.
+    """
+    try:
+        remaining = int(headers.get('X-RateLimit-Remaining', None))
+    except (TypeError, ValueError):
+        remaining = None
+    try:
+        reset = float(headers.get('X-RateLimit-Reset', None))
+    except (TypeError, ValueError):
+        reset = None
+    return remaining, reset
+
+
+def parse_retry_after(value):
+    """Return the delay in seconds of a Retry-After header, or None.
+
+    Positional arguments:
+        value: str -- delay in seconds, or an HTTP date.
+    """
+    from email.utils import parsedate_to_datetime
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class _TokenBucket:
+    """The request budget of a single host."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blockedUntil = 0.0
+        # monotonic time until which the host refuses requests
+        self.slowedUntil = 0.0
+        # monotonic time until which a reduced rate applies
+
+
+class RateLimiter:
+    """Token buckets limiting the request rate per host.
+
+    Each request takes a token; the tokens are refilled at a fixed rate,
+    up to the burst size. A request without a token waits for the next.
+    The limiter is adjusted by the responses' rate limit headers:
+
+    - Retry-After with a 429 or 403 response blocks the host
+      for the given time.
+    - If X-RateLimit-Remaining is 0, the host is blocked until
+      X-RateLimit-Reset.
+    - Otherwise, the remaining requests are spread evenly
+      until the reset, if this is slower than the default rate.
+
+    Rather than waiting longer than maxWait, the limiter raises
+    RateLimitExceeded. The limiter is thread-safe.
+    """
+    RATE = 10.0
+    # default number of requests per second and host
+    BURST = 10
+    # maximum number of requests sent at once
+    MAX_WAIT = 10.0
+    # maximum time in seconds a request waits for its turn
+
+    def __init__(self, rate=None, burst=None, maxWait=None):
+        """Set the default request rate.
+
+        Optional arguments:
+            rate: float -- number of requests per second and host.
+            burst: int -- maximum number of requests sent at once.
+            maxWait: float -- maximum time in seconds to wait for a token.
+        """
+        if not rate or rate <= 0:
+            rate = self.RATE
+        self.rate = rate
+        if not burst or burst < 1:
+            burst = self.BURST
+        self.burst = burst
+        if maxWait is None or maxWait < 0:
+            maxWait = self.MAX_WAIT
+        self.maxWait = maxWait
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        """Wait until a request to host may be sent.
+
+        Raise RateLimitExceeded if the wait would exceed maxWait.
+        """
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_blocked_hosts(self):
+        """Return a dictionary with the reset epoch times of blocked hosts."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: time.time() + bucket.blockedUntil - now
+                for host, bucket in self._buckets.items()
+                if bucket.blockedUntil > now
+            }
+
+    def reserve(self, host):
+        """Take a token for a request to host; return the delay in seconds.
+
+        The request must not be sent before the delay has passed.
+        Raise RateLimitExceeded if the delay would exceed maxWait;
+        then no token is taken.
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._get_bucket(host, now)
+            blocked = max(bucket.blockedUntil - now, 0)
+            if bucket.tokens >= 1:
+                delay = blocked
+            else:
+                delay = max(blocked, (1 - bucket.tokens) / bucket.rate)
+            if delay > self.maxWait:
+                raise RateLimitExceeded(host, time.time() + delay)
+
+            bucket.tokens -= 1
+            return delay
+
+    def update(self, host, status, headers):
+        """Adjust the host's budget to the rate limit headers of a response.
+
+        Positional arguments:
+            host: str -- the host name.
+            status: int -- HTTP status code of the response.
+            headers -- the response headers.
+        """
+        retryAfter = parse_retry_after(headers.get('Retry-After', None))
+        remaining, reset = parse_quota(headers)
+        if retryAfter is None and remaining is None:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._get_bucket(host, now)
+            if retryAfter is not None and status in (403, 429, 503):
+                bucket.blockedUntil = max(
+                    bucket.blockedUntil,
+                    now + retryAfter,
+                )
+                return
+
+            if remaining is None or reset is None:
+                return
+
+            resetDelay = reset - time.time()
+            if resetDelay <= 0:
+                return
+
+            if remaining <= 0:
+                bucket.blockedUntil = max(
+                    bucket.blockedUntil,
+                    now + resetDelay,
+                )
+                return
+
+            rate = remaining / resetDelay
+            if rate < self.rate:
+                bucket.rate = rate
+                bucket.tokens = min(bucket.tokens, 1)
+                bucket.slowedUntil = now + resetDelay
+
+    def _get_bucket(self, host, now):
+        # Return the host's bucket with the tokens refilled up to now.
+        bucket = self._buckets.get(host, None)
+        if bucket is None:
+            bucket = _TokenBucket(self.rate, self.burst)
+            self._buckets[host] = bucket
+            return bucket
+
+        if bucket.slowedUntil and now >= bucket.slowedUntil:
+            bucket.rate = self.rate
+            bucket.slowedUntil = 0.0
+        bucket.tokens = min(
+            bucket.tokens + (now - bucket.updated) * bucket.rate,
+            self.burst,
+        )
+        bucket.updated = now
+        return bucket
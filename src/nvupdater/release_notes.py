@@ -0,0 +1,70 @@
+"""Provide functions for the release notes of a component update.
+
+The release notes are read from the repository's changelog,
+a Markdown file with a heading per version:
+
+### Version 5.4.5
+
+- Changed the window title.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import re
+
+from nvupdater.semantic_version import Version
+
+CHANGELOG_PATH = 'raw/main/docs/changelog.md'
+# path of the changelog relative to the repository URL
+HEADING = re.compile(
+    r'^(#{1,6})\s*(?:version\s+)?\[?(v?\d+[^\s\]]*)\]?.*$',
+    flags=re.IGNORECASE | re.MULTILINE,
+)
+
+
+def get_changelog_url(repoUrl):
+    """Return the URL of the repository's changelog."""
+    return f'{repoUrl}/{CHANGELOG_PATH}'
+
+
+def extract_release_notes(text, current, update):
+    """Return the changelog sections of the versions an update brings.
+
+    Positional arguments:
+        text: str -- the changelog in Markdown.
+        current: Version -- the installed version, or None if unknown.
+        update: Version -- the version to update to.
+
+    The sections of the versions newer than current, up to update,
+    are returned in the changelog's order, separated by blank lines.
+    If current is None, only the update's section is returned.
+    Return an empty string if the changelog has no such section.
+    """
+    sections = []
+    headings = list(HEADING.finditer(text))
+    for i, heading in enumerate(headings):
+        try:
+            version = Version.parse(heading.group(2))
+        except ValueError:
+            continue
+
+        if version > update:
+            continue
+
+        if current is None:
+            if version != update:
+                continue
+
+        elif version <= current:
+            continue
+
+        end = len(text)
+        level = len(heading.group(1))
+        for nextHeading in headings[i + 1:]:
+            if len(nextHeading.group(1)) <= level:
+                end = nextHeading.start()
+                break
+
+        sections.append(text[heading.start():end].strip())
+    return '\n\n'.join(sections)
@@ -0,0 +1,84 @@
+"""Provide a class for a size-bounded memory cache of release notes.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from collections import OrderedDict
+import threading
+
+
+class ReleaseNotesCache:
+    """Release notes by repository URL, least recently used first.
+
+    Each entry is tagged with the installed and the update version,
+    so it becomes invalid when the VERSION data of the repository,
+    or the installed version, changes.
+    When the total size exceeds the limit, the least recently
+    used entries are discarded.
+    """
+    MAX_SIZE = 262144
+    # default maximum number of characters kept
+
+    def __init__(self, maxSize=None):
+        """Set the size limit.
+
+        Optional arguments:
+            maxSize: int -- maximum total number of characters kept.
+        """
+        if not maxSize or maxSize < 1:
+            maxSize = self.MAX_SIZE
+        self.maxSize = maxSize
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, repoUrl, current, update):
+        """Return the release notes, or None if not cached.
+
+        Positional arguments:
+            repoUrl: str -- URL of the repository.
+            current: Version -- the installed version, or None if unknown.
+            update: Version -- the version to update to.
+
+        An entry stored for other versions is removed.
+        """
+        tag = (str(current), str(update))
+        with self._lock:
+            entry = self._entries.get(repoUrl, None)
+            if entry is None:
+                return None
+
+            if entry[0] != tag:
+                self._remove(repoUrl)
+                return None
+
+            self._entries.move_to_end(repoUrl)
+            return entry[1]
+
+    def store(self, repoUrl, current, update, notes):
+        """Add or replace the release notes for repoUrl.
+
+        Positional arguments:
+            repoUrl: str -- URL of the repository.
+            current: Version -- the installed version, or None if unknown.
+            update: Version -- the version to update to.
+            notes: str -- the release notes.
+
+        Notes larger than the size limit are not stored.
+        """
+        with self._lock:
+            if repoUrl in self._entries:
+                self._remove(repoUrl)
+            if len(notes) > self.maxSize:
+                return
+
+            self._entries[repoUrl] = ((str(current), str(update)), notes)
+            self.size += len(notes)
+            while self.size > self.maxSize:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, repoUrl):
+        # Remove an entry; the lock must be held.
+        __, notes = self._entries.pop(repoUrl)
+        self.size -= len(notes)
@@ -0,0 +1,140 @@
+"""Provide a class for fetching release notes in the background.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import queue
+import threading
+
+from nvupdater.lookup_result import LookupResult
+from nvupdater.release_notes import extract_release_notes
+from nvupdater.release_notes import get_changelog_url
+
+
+class ReleaseNotesLoader:
+    """Download the changelogs of outdated components on a small pool.
+
+    Only the sections of the versions an update brings are kept,
+    in a ReleaseNotesCache shared by all dialogs.
+    LookupResult instances with the release notes as data are posted
+    to a thread-safe queue, so the GUI thread can process them
+    without blocking.
+    """
+    MAX_WORKERS = 2
+
+    def __init__(self, remoteData, cache, maxWorkers=None):
+        """Set the download parameters.
+
+        Positional arguments:
+            remoteData -- RemoteData instance for the downloads.
+            cache -- ReleaseNotesCache instance.
+
+        Optional arguments:
+            maxWorkers: int -- maximum number of concurrent downloads.
+        """
+        self.results = queue.Queue()
+        self._remoteData = remoteData
+        self._cache = cache
+        if not maxWorkers or maxWorkers < 1:
+            maxWorkers = self.MAX_WORKERS
+        self._maxWorkers = maxWorkers
+        self._executor = None
+        self._futures = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def get(self, repoUrl, current, update):
+        """Return the cached release notes, or None."""
+        return self._cache.get(repoUrl, current, update)
+
+    def get_results(self, maxItems=None):
+        """Return a list with the results available so far.
+
+        Optional arguments:
+            maxItems: int -- maximum number of results to return.
+
+        Do not block.
+        """
+        items = []
+        while maxItems is None or len(items) < maxItems:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def is_running(self):
+        """Return True if downloads are pending."""
+        with self._lock:
+            return bool(self._futures)
+
+    def request(self, repoName, repoUrl, current, update):
+        """Fetch the release notes of an update in the background.
+
+        Positional arguments:
+            repoName: str -- name of the component.
+            repoUrl: str -- URL of the repository.
+            current: Version -- the installed version, or None if unknown.
+            update: Version -- the version to update to.
+
+        Return True if a download is started,
+        or False if the release notes are cached.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self._cache.get(repoUrl, current, update) is not None:
+            return False
+
+        with self._lock:
+            self._stopped.clear()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._maxWorkers,
+                    thread_name_prefix='nv_updater_notes',
+                )
+            future = self._executor.submit(
+                self._load,
+                repoName,
+                repoUrl,
+                current,
+                update,
+            )
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+        return True
+
+    def stop(self):
+        """Cancel the pending downloads."""
+        self._stopped.set()
+        with self._lock:
+            for future in self._futures:
+                future.cancel()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self._remoteData.close()
+
+    def _discard(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def _load(self, repoName, repoUrl, current, update):
+        # Worker thread: download the changelog and post the notes.
+        try:
+            text = self._remoteData.get_file(
+                get_changelog_url(repoUrl)
+            ).decode('utf-8', errors='replace')
+            notes = extract_release_notes(text, current, update)
+        except Exception as ex:
+            if not self._stopped.is_set():
+                self.results.put(LookupResult.from_error(repoName, ex))
+            return
+
+        self._cache.store(repoUrl, current, update, notes)
+        if not self._stopped.is_set():
+            self.results.put(LookupResult(
+                repoName,
+                LookupResult.OK,
+                data=notes,
+            ))
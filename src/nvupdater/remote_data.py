@@ -0,0 +1,320 @@
+"""Provide a class for retrieving a repository's latest version data.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from nvupdater.connection_pool import ConnectionPool
+from nvupdater.lookup_timing import LookupTiming
+from nvupdater.rate_limiter import get_rate_limit_error
+from nvupdater.version_parser import VersionInfo
+from nvupdater.version_parser import parse_releases
+
+
+class RemoteData:
+    """Read the latest version data from the repositories' VERSION files.
+    
+    If a VersionCache is given, fresh entries are served without
+    network access, and stale entries are revalidated
+    with a conditional request.
+    If a VersionIndex is given, it is consulted before
+    the repository's own VERSION file.
+    If a VersionMirror is given, the VERSION files are read
+    from the local mirror only, without any network access.
+    All requests share a pool of persistent connections.
+    Transient errors are retried with jittered exponential backoff.
+    
+    The lookup result is a list of VersionInfo instances
+    for the releases listed in the VERSION file, newest first.
+    Choosing one of them is up to the update resolver.
+    """
+    RETRIES = 2
+    BACKOFF = 0.5
+    # base delay in seconds before the first retry
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(
+            self,
+            cache=None,
+            connectionPool=None,
+            retries=None,
+            backoff=None,
+            versionIndex=None,
+            mirror=None,
+        ):
+        """Set the version cache, the connection pool, and the retry policy.
+        
+        Optional arguments:
+            cache -- VersionCache instance, or None.
+            connectionPool -- ConnectionPool instance; 
+                              if None, a new one is created.
+            retries: int -- maximum number of retries per lookup.
+            backoff: float -- base delay in seconds before the first retry.
+            versionIndex -- VersionIndex instance, or None.
+            mirror -- VersionMirror instance, or None.
+        """
+        self._cache = cache
+        if connectionPool is None:
+            connectionPool = ConnectionPool()
+        self._connectionPool = connectionPool
+        if retries is None or retries < 0:
+            retries = self.RETRIES
+        self.retries = retries
+        if backoff is None or backoff < 0:
+            backoff = self.BACKOFF
+        self.backoff = backoff
+        self._versionIndex = versionIndex
+        self._mirror = mirror
+        self._closed = threading.Event()
+
+    def close(self):
+        """Stop retrying and close the persistent connections."""
+        self._closed.set()
+        self._connectionPool.close()
+
+    def get_file(self, url, timing=None):
+        """Return the content of a file as bytes.
+        
+        Positional arguments:
+            url: str -- URL of the file.
+        
+        Optional arguments:
+            timing -- LookupTiming instance to record the timings in.
+        
+        The cache, the version index, and the mirror are not used.
+        Raise an exception if the file cannot be read.
+        """
+        response = self._fetch(url, {}, timing)
+        self._check_status(response)
+        return response.body
+
+    def get_local_data(self, repoUrl, timing=None):
+        """Return the version data, if available without a download.
+        
+        Positional arguments:
+            repoUrl: str -- URL of the GitHub repository.
+        
+        Optional arguments:
+            timing -- LookupTiming instance to record the timings in.
+        
+        Return a list of VersionInfo instances, or None if the data 
+        must be downloaded. The sources are, in this order:
+        the mirror, a fresh cache entry, and the version index.
+        """
+        if self._mirror is not None:
+            if timing is not None:
+                timing.source = LookupTiming.MIRROR
+            versionInfo = self._mirror.read(repoUrl)
+            start = time.perf_counter()
+            result = parse_releases(versionInfo)
+            if timing is not None:
+                timing.parse = time.perf_counter() - start
+            return result
+
+        if self._cache is not None:
+            entry = self._cache.get(repoUrl)
+            if entry is not None and self._cache.is_fresh(entry):
+                if timing is not None:
+                    timing.source = LookupTiming.CACHE
+                return self._from_entry(entry)
+
+        if self._versionIndex is not None:
+            indexEntry = self._versionIndex.get(repoUrl)
+            if indexEntry is not None:
+                try:
+                    versionInfo = VersionInfo.from_dict(indexEntry)
+                except ValueError:
+                    # Fall back to the repository's VERSION file.
+                    versionInfo = None
+                if versionInfo is not None:
+                    if timing is not None:
+                        timing.source = LookupTiming.INDEX
+                    return [versionInfo]
+
+        return None
+
+    def get_remote_data(self, repoUrl, timing=None):
+        """Return a list of VersionInfo instances, newest first.
+        
+        Positional arguments:
+            repoUrl: str -- URL of the GitHub repository.
+        
+        Optional arguments:
+            timing -- LookupTiming instance to record the timings in.
+        
+        Raise an exception if the VERSION file cannot be read or parsed.
+        """
+        result = self.get_local_data(repoUrl, timing=timing)
+        if result is not None:
+            return result
+
+        return self.revalidate(repoUrl, timing=timing)
+
+    def get_request_headers(self, repoUrl):
+        """Return a dictionary with the conditional request headers."""
+        headers = {}
+        if self._cache is not None:
+            entry = self._cache.get(repoUrl)
+            if entry is not None:
+                if entry['etag']:
+                    headers['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def get_version_url(self, repoUrl):
+        """Return the URL of the repository's VERSION file."""
+        return f'{repoUrl}/raw/main/VERSION'
+
+    def get_version_info(self, repoUrl, timing=None):
+        """Return the content of the repository's VERSION file.
+        
+        Positional arguments:
+            repoUrl: str -- URL of the GitHub repository.
+        
+        Optional arguments:
+            timing -- LookupTiming instance to record the timings in.
+        
+        The file is always downloaded; the cache is bypassed.
+        Raise an exception if the file cannot be read or parsed.
+        """
+        response = self._fetch(self.get_version_url(repoUrl), {}, timing)
+        self._check_status(response)
+        if timing is not None:
+            timing.source = LookupTiming.NETWORK
+        versionInfo = response.body.decode('utf-8')
+        parse_releases(versionInfo)
+        return versionInfo
+
+    def process_response(self, repoUrl, response, timing=None):
+        """Return the version data extracted from a VERSION file download.
+        
+        Positional arguments:
+            repoUrl: str -- URL of the GitHub repository.
+            response -- Response instance.
+        
+        Optional arguments:
+            timing -- LookupTiming instance to record the timings in.
+        
+        Return a list of VersionInfo instances, newest first.
+        A "304 Not modified" response is answered from the cache.
+        Raise an exception if the response cannot be used.
+        """
+        if response.status == 304 and self._cache is not None:
+            entry = self._cache.get(repoUrl)
+            if entry is not None:
+                # The cached data is still valid.
+                if timing is not None:
+                    timing.source = LookupTiming.REVALIDATED
+                self._cache.touch(repoUrl)
+                return self._from_entry(entry)
+
+        self._check_status(response)
+        if timing is not None:
+            timing.source = LookupTiming.NETWORK
+        start = time.perf_counter()
+        releases = parse_releases(response.body)
+        if timing is not None:
+            timing.parse = time.perf_counter() - start
+        if self._cache is not None:
+            latest = releases[0]
+            self._cache.store(
+                repoUrl,
+                str(latest.version),
+                latest.downloadLink,
+                etag=response.headers.get('ETag', None),
+                lastModified=response.headers.get('Last-Modified', None),
+                extra=dict(
+                    releases=[release.as_dict() for release in releases]
+                ),
+            )
+        return releases
+
+    def revalidate(self, repoUrl, timing=None):
+        """Return a list of VersionInfo instances, newest first.
+        
+        Positional arguments:
+            repoUrl: str -- URL of the GitHub repository.
+        
+        Optional arguments:
+            timing -- LookupTiming instance to record the timings in.
+        
+        Unlike get_remote_data(), always send a request; 
+        a cached entry is only used for the conditional request headers.
+        Raise an exception if the VERSION file cannot be read or parsed.
+        """
+        response = self._fetch(
+            self.get_version_url(repoUrl),
+            self.get_request_headers(repoUrl),
+            timing,
+        )
+        return self.process_response(repoUrl, response, timing=timing)
+
+    def _check_status(self, response):
+        # Raise RateLimitExceeded if the host refused the request
+        # due to its rate limit, or HTTPError if the status is not OK.
+        from urllib.error import HTTPError
+
+        rateLimitError = get_rate_limit_error(
+            urlsplit(response.url).hostname,
+            response.status,
+            response.headers,
+        )
+        if rateLimitError is not None:
+            raise rateLimitError
+
+        if response.status != 200:
+            raise HTTPError(
+                response.url,
+                response.status,
+                f'HTTP status {response.status}',
+                response.headers,
+                None,
+            )
+
+    def _fetch(self, url, headers, timing):
+        # Return the response; retry on transient errors.
+        import http.client
+
+        attempt = 0
+        while True:
+            try:
+                response = self._connectionPool.get(
+                    url,
+                    headers=headers,
+                    timing=timing,
+                )
+            except (OSError, http.client.HTTPException):
+                if not self._wait_for_retry(attempt):
+                    raise
+
+            else:
+                if response.status not in self.RETRY_STATUS:
+                    return response
+
+                if not self._wait_for_retry(attempt):
+                    return response
+
+            attempt += 1
+
+    def _from_entry(self, entry):
+        # Return a list of VersionInfo instances for a cache entry.
+        releases = entry.get('releases', None)
+        if not releases:
+            return [VersionInfo.from_dict(entry)]
+
+        return [VersionInfo.from_dict(release) for release in releases]
+
+    def _wait_for_retry(self, attempt):
+        # Sleep before the next attempt ("full jitter" backoff).
+        # Return False if no retry is allowed.
+        if attempt >= self.retries or self._closed.is_set():
+            return False
+
+        delay = random.uniform(0, self.backoff * 2 ** attempt)
+        return not self._closed.wait(delay)
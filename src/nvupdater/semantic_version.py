@@ -0,0 +1,146 @@
+"""Provide a class for semantic version numbers.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import re
+
+
+class Version:
+    """A version number like 1.2.3, 1.2.3-beta.1, or 1.2.3+build.5.
+
+    The comparison key is computed once, so comparing and sorting
+    is a plain tuple comparison. Pre-releases rank below the release,
+    and build metadata is ignored, as specified by Semantic Versioning.
+    """
+    __slots__ = ('major', 'minor', 'patch', 'prerelease', 'build', 'key')
+
+    PATTERN = re.compile(
+        r'v?(\d+)(?:\.(\d+))?(?:\.(\d+))?'
+        r'(?:-([0-9A-Za-z.-]+))?'
+        r'(?:\+([0-9A-Za-z.-]+))?'
+    )
+
+    def __init__(self, major, minor=0, patch=0, prerelease=(), build=''):
+        """Set the version number components.
+
+        Positional arguments:
+            major: int -- major version number.
+
+        Optional arguments:
+            minor: int -- minor version number.
+            patch: int -- patch level.
+            prerelease: tuple -- pre-release identifiers, e.g. ('beta', '1').
+            build: str -- build metadata.
+        """
+        self.major = major
+        self.minor = minor
+        self.patch = patch
+        self.prerelease = tuple(prerelease)
+        self.build = build
+        prereleaseKey = tuple(
+            (0, int(identifier), '') if identifier.isdigit()
+            else (1, 0, identifier)
+            for identifier in self.prerelease
+        )
+        self.key = (major, minor, patch, not self.prerelease, prereleaseKey)
+
+    @classmethod
+    def parse(cls, text):
+        """Return a Version instance for text.
+
+        Raise ValueError if text is not a version number.
+        """
+        match = cls.PATTERN.fullmatch(text.strip())
+        if match is None:
+            raise ValueError(f'Invalid version number: "{text}"')
+
+        major, minor, patch, prerelease, build = match.groups()
+        if prerelease:
+            prerelease = prerelease.split('.')
+        else:
+            prerelease = ()
+        return cls(
+            int(major),
+            int(minor or 0),
+            int(patch or 0),
+            prerelease=prerelease,
+            build=build or '',
+        )
+
+    @classmethod
+    def from_string(cls, text):
+        """Return a Version instance for text, or None if not applicable."""
+        try:
+            return cls.parse(text)
+
+        except (ValueError, AttributeError):
+            return None
+
+    @property
+    def isPrerelease(self):
+        return bool(self.prerelease)
+
+    def __eq__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __lt__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.key < other.key
+
+    def __le__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.key <= other.key
+
+    def __gt__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.key > other.key
+
+    def __ge__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+
+        return self.key >= other.key
+
+    def __repr__(self):
+        return f'Version({str(self)!r})'
+
+    def __str__(self):
+        text = f'{self.major}.{self.minor}.{self.patch}'
+        if self.prerelease:
+            text = f'{text}-{".".join(self.prerelease)}'
+        if self.build:
+            text = f'{text}+{self.build}'
+        return text
+
+
+def update_available(latest, current, beta=False):
+    """Return True, if the latest version should replace the current one.
+
+    Positional arguments:
+        latest: Version -- the latest version.
+        current: Version -- the installed version, or None if unknown.
+
+    Optional arguments:
+        beta: bool -- if True, pre-releases are offered as updates.
+    """
+    if latest.isPrerelease and not beta:
+        return False
+
+    if current is None:
+        return True
+
+    return latest > current
@@ -0,0 +1,234 @@
+"""Provide a class for checking repositories in the background.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import queue
+import threading
+
+from nvupdater.async_lookup_engine import AsyncLookupEngine
+from nvupdater.connection_pool import ConnectionPool
+from nvupdater.daemon_client import DaemonClient
+from nvupdater.lookup_engine import LookupEngine
+from nvupdater.rate_limiter import RateLimiter
+from nvupdater.nvupdater_globals import NOVELIBRE_URL
+from nvupdater.remote_data import RemoteData
+from nvupdater.semantic_version import Version
+from nvupdater.version_index import VersionIndex
+from nvupdater.version_mirror import VersionMirror
+
+
+def collect_repositories(plugins):
+    """Return a tuple of dictionaries (installed versions, repository URLs).
+
+    Positional arguments:
+        plugins -- novelibre's plugin collection.
+
+    Both dictionaries are keyed by repository name, starting with novelibre.
+    The installed versions are Version instances,
+    or None if unknown. Rejected plugins are skipped.
+    """
+    repoName = 'novelibre'
+    currentVersions = {
+        repoName: Version(
+            plugins.majorVersion,
+            plugins.minorVersion,
+            plugins.patchlevel,
+        )
+    }
+    repoUrls = {repoName: NOVELIBRE_URL}
+    for repoName in plugins:
+        if plugins[repoName].isRejected:
+            continue
+
+        try:
+            current = Version.from_string(plugins[repoName].VERSION)
+        except AttributeError:
+            current = None
+        currentVersions[repoName] = current
+        try:
+            repoUrls[repoName] = plugins[repoName].URL
+        except AttributeError:
+            repoUrls[repoName] = None
+    return currentVersions, repoUrls
+
+
+class UpdateChecker:
+    """Run the lookup engine on a worker thread.
+
+    The LookupResult instances are posted to a thread-safe queue,
+    so the GUI thread can process them without blocking.
+    A None item marks the end of the check.
+    
+    If a local update daemon is configured and running, the daemon
+    is asked first. Otherwise, the repositories are looked up directly.
+
+    The timing records of the last check are kept in the timings list,
+    and optionally appended to a JSON lines log file.
+    """
+
+    def __init__(self, prefs, versionCache=None, rateLimiter=None):
+        """Set the lookup parameters.
+
+        Positional arguments:
+            prefs: dict -- the plugin's settings.
+
+        Optional arguments:
+            versionCache -- VersionCache instance shared by all checks.
+            rateLimiter -- RateLimiter instance shared by all checks;
+                           if None, a new one is created.
+        """
+        self.results = queue.Queue()
+        self._prefs = prefs
+        self._versionCache = versionCache
+        self._remoteData = None
+        self._lookupEngine = None
+        self._daemonClient = None
+        if rateLimiter is None:
+            rateLimiter = RateLimiter(rate=float(prefs['rate_limit']))
+        self.rateLimiter = rateLimiter
+        self._stopped = threading.Event()
+        self._thread = None
+        self.timings = []
+
+    def get_results(self, maxItems=None):
+        """Return a list with the results available so far.
+
+        Optional arguments:
+            maxItems: int -- maximum number of results to return.
+
+        Do not block. The end-of-check marker None is included.
+        """
+        items = []
+        while maxItems is None or len(items) < maxItems:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def is_running(self):
+        """Return True if a check is in progress."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, repoUrls):
+        """Start checking the repositories in the background.
+
+        Positional arguments:
+            repoUrls: dict -- repository URLs by repository name.
+
+        Do nothing if a check is already running.
+        """
+        if self.is_running():
+            return
+
+        self._stopped.clear()
+        self.results = queue.Queue()
+        self.timings = []
+        connectionPool = ConnectionPool(
+            connectTimeout=float(self._prefs['connect_timeout']),
+            readTimeout=float(self._prefs['read_timeout']),
+            rateLimiter=self.rateLimiter,
+        )
+        if self._prefs['version_index']:
+            versionIndex = VersionIndex(
+                self._prefs['version_index'],
+                connectionPool=connectionPool,
+            )
+        else:
+            versionIndex = None
+        if self._prefs['mirror']:
+            mirror = VersionMirror(self._prefs['mirror'])
+        else:
+            mirror = None
+        self._remoteData = RemoteData(
+            cache=self._versionCache,
+            connectionPool=connectionPool,
+            retries=int(self._prefs['retries']),
+            versionIndex=versionIndex,
+            mirror=mirror,
+        )
+        if self._prefs['engine'] == 'asyncio':
+            self._lookupEngine = AsyncLookupEngine(
+                self._remoteData,
+                maxWorkers=int(self._prefs['max_workers']),
+                timeout=float(self._prefs['check_timeout']),
+                connectTimeout=float(self._prefs['connect_timeout']),
+                readTimeout=float(self._prefs['read_timeout']),
+                rateLimiter=self.rateLimiter,
+            )
+        else:
+            self._lookupEngine = LookupEngine(
+                self._remoteData.get_remote_data,
+                maxWorkers=int(self._prefs['max_workers']),
+                timeout=float(self._prefs['check_timeout']),
+            )
+        if self._prefs['daemon_socket']:
+            self._daemonClient = DaemonClient(
+                self._prefs['daemon_socket'],
+                timeout=float(self._prefs['check_timeout']),
+            )
+        else:
+            self._daemonClient = None
+        self._thread = threading.Thread(
+            target=self._check,
+            args=(repoUrls,),
+            name='nv_updater_check',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the check; pending lookups are cancelled."""
+        self._stopped.set()
+        if self._lookupEngine is not None:
+            self._lookupEngine.cancel()
+        if self._remoteData is not None:
+            self._remoteData.close()
+
+    def _check(self, repoUrls):
+        # Worker thread: post the lookup results to the queue.
+        try:
+            results = self._query_daemon(repoUrls)
+            if results is None:
+                results = self._lookupEngine.run(repoUrls)
+            for result in results:
+                if self._stopped.is_set():
+                    break
+
+                if result.timing is not None:
+                    self.timings.append(result.timing)
+                self.results.put(result)
+        finally:
+            self._remoteData.close()
+            if self._versionCache is not None:
+                self._versionCache.write()
+            self._write_timing_log()
+            self.results.put(None)
+
+    def _query_daemon(self, repoUrls):
+        # Return the update daemon's results,
+        # or None if the daemon is not configured or not running.
+        if self._daemonClient is None or not self._daemonClient.is_available():
+            return None
+
+        try:
+            return self._daemonClient.query(repoUrls)
+
+        except (OSError, ValueError):
+            return None
+
+    def _write_timing_log(self):
+        # Append the timing records to the log file, if configured.
+        logPath = self._prefs.get('timing_log', '')
+        if not logPath or not self.timings:
+            return
+
+        try:
+            with open(logPath, 'a', encoding='utf-8') as f:
+                for timing in self.timings:
+                    f.write(f'{json.dumps(timing.as_dict())}\n')
+        except OSError:
+            pass
@@ -0,0 +1,359 @@
+"""Run a local daemon that answers the update checks of novelibre instances.
+
+Usage:
+python -m nvupdater.update_daemon --socket PATH [--cache FILE]
+                                  [--mode 660] [--group GROUP]
+
+The daemon owns the version cache and the connection pool.
+novelibre instances with the "daemon_socket" setting ask the daemon
+over its Unix socket instead of looking up the repositories themselves.
+Concurrent lookups of the same repository are merged, and the
+repositories asked for are revalidated in the background before their
+cache entries expire. So the number of requests sent to GitHub does not
+depend on the number of novelibre instances, and most queries are
+answered from the cache.
+
+By default, only the user running the daemon may connect to the
+socket. To serve several users, give the socket to a group
+they share and make it group-writable.
+Unix sockets are not available on Windows.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from nvupdater.daemon_client import MAX_MESSAGE_SIZE
+from nvupdater.daemon_client import result_to_dict
+from nvupdater.lookup_engine import LookupEngine
+from nvupdater.nvupdater_globals import CACHE_DIR
+from nvupdater.remote_data import RemoteData
+from nvupdater.version_cache import VersionCache
+
+DAEMON_CACHE = f'{CACHE_DIR}/nv_updater_daemon.json'
+
+
+class UpdateDaemon:
+    """Serve version queries over a Unix socket."""
+    REFRESH_INTERVAL = 600
+    # default time in seconds between background refreshes
+    MAX_REPOSITORIES = 1000
+    # maximum number of repositories refreshed in the background
+    SOCKET_MODE = 0o600
+    # default permissions: only the owner may connect
+
+    def __init__(
+            self,
+            socketPath,
+            cache,
+            maxWorkers=None,
+            timeout=None,
+            refreshInterval=None,
+            remoteData=None,
+            socketMode=None,
+            socketGroup=None,
+        ):
+        """Set the socket path and the lookup parameters.
+
+        Positional arguments:
+            socketPath: str -- path to the Unix socket to listen on.
+            cache -- VersionCache instance shared by all queries.
+
+        Optional arguments:
+            maxWorkers: int -- maximum number of concurrent lookups.
+            timeout: float -- deadline of a query in seconds.
+            refreshInterval: float -- time in seconds between refreshes.
+            remoteData -- RemoteData instance using the cache;
+                          if None, a new one is created.
+            socketMode: int -- permission bits of the socket file.
+            socketGroup: str -- name of the group owning the socket file;
+                                if None, the group is not changed.
+        """
+        self.socketPath = socketPath
+        self._cache = cache
+        self.maxWorkers = maxWorkers
+        self.timeout = timeout
+        if not refreshInterval or refreshInterval <= 0:
+            refreshInterval = self.REFRESH_INTERVAL
+        self.refreshInterval = refreshInterval
+        if remoteData is None:
+            remoteData = RemoteData(cache=cache)
+        self._remoteData = remoteData
+        if socketMode is None:
+            socketMode = self.SOCKET_MODE
+        self.socketMode = socketMode
+        self.socketGroup = socketGroup
+        self._repoUrls = set()
+        # the repositories to refresh in the background
+        self._repoLocks = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server = None
+
+    def lookup(self, repoUrls):
+        """Return a list of LookupResult instances.
+
+        Positional arguments:
+            repoUrls: dict -- repository URLs by repository name.
+        """
+        lookupEngine = LookupEngine(
+            self._lookup,
+            maxWorkers=self.maxWorkers,
+            timeout=self.timeout,
+        )
+        results = list(lookupEngine.run(repoUrls))
+        self._cache.write()
+        return results
+
+    def refresh(self):
+        """Revalidate the entries that would expire before the next refresh.
+
+        Return the number of revalidated repositories.
+        """
+        with self._lock:
+            repoUrls = {
+                repoUrl: repoUrl for repoUrl in self._repoUrls
+                if self._expires_soon(repoUrl)
+            }
+        if not repoUrls:
+            return 0
+
+        lookupEngine = LookupEngine(
+            self._revalidate,
+            maxWorkers=self.maxWorkers,
+            timeout=self.timeout,
+        )
+        for __ in lookupEngine.run(repoUrls):
+            pass
+        self._cache.write()
+        return len(repoUrls)
+
+    def serve_forever(self):
+        """Listen on the socket until stop() is called.
+
+        Raise OSError if the socket cannot be created,
+        e.g. because another daemon is listening on it.
+        Raise KeyError if the socket group does not exist.
+        """
+        self._remove_stale_socket()
+        self._server = socketserver.ThreadingUnixStreamServer(
+            self.socketPath,
+            _RequestHandler,
+        )
+        self._server.daemon_threads = True
+        self._server.updateDaemon = self
+        refreshThread = threading.Thread(
+            target=self._refresh_periodically,
+            name='nv_updater_refresh',
+            daemon=True,
+        )
+        try:
+            if self.socketGroup is not None:
+                import grp
+                os.chown(
+                    self.socketPath,
+                    -1,
+                    grp.getgrnam(self.socketGroup).gr_gid,
+                )
+            os.chmod(self.socketPath, self.socketMode)
+            self._stopped.clear()
+            refreshThread.start()
+            self._server.serve_forever()
+        finally:
+            self._stopped.set()
+            self._server.server_close()
+            try:
+                os.remove(self.socketPath)
+            except OSError:
+                pass
+            self._remoteData.close()
+            self._cache.write()
+
+    def stop(self):
+        """Make serve_forever() return; call from another thread."""
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _expires_soon(self, repoUrl):
+        # Return True if the cache entry expires before the next refresh.
+        entry = self._cache.get(repoUrl)
+        if entry is None:
+            return True
+
+        age = time.time() - entry.get('fetched', 0)
+        return age > self._cache.ttl - self.refreshInterval
+
+    def _get_repo_lock(self, repoUrl):
+        # Return the lock that merges the lookups of a repository.
+        with self._lock:
+            return self._repoLocks.setdefault(repoUrl, threading.Lock())
+
+    def _lookup(self, repoUrl, timing):
+        # Worker thread: look up a repository on behalf of a client.
+        # While a lookup is in progress, the same repository's lookups
+        # wait for it, and then usually find a fresh cache entry.
+        with self._lock:
+            if repoUrl and len(self._repoUrls) < self.MAX_REPOSITORIES:
+                self._repoUrls.add(repoUrl)
+        with self._get_repo_lock(repoUrl):
+            return self._remoteData.get_remote_data(repoUrl, timing=timing)
+
+    def _refresh_periodically(self):
+        # Refresh thread.
+        while not self._stopped.wait(self.refreshInterval):
+            self.refresh()
+
+    def _remove_stale_socket(self):
+        # Remove the socket file left by a daemon that is gone.
+        if not os.path.exists(self.socketPath):
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            try:
+                s.connect(self.socketPath)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.remove(self.socketPath)
+                return
+
+        raise OSError(f'Another daemon is listening on "{self.socketPath}"')
+
+    def _revalidate(self, repoUrl, timing):
+        # Refresh thread: revalidate a repository's cache entry.
+        with self._get_repo_lock(repoUrl):
+            if not self._expires_soon(repoUrl):
+                # A client has just refreshed the entry.
+                return None
+
+            return self._remoteData.revalidate(repoUrl, timing=timing)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer a single query."""
+    timeout = 10
+    # maximum time in seconds to wait for the request
+
+    def handle(self):
+        try:
+            request = json.loads(
+                self.rfile.readline(MAX_MESSAGE_SIZE).decode('utf-8')
+            )
+            repoUrls = request['repos']
+            if not isinstance(repoUrls, dict):
+                raise TypeError('"repos" is not an object')
+
+            results = self.server.updateDaemon.lookup(repoUrls)
+            reply = dict(results=[result_to_dict(r) for r in results])
+        except (ValueError, KeyError, TypeError) as ex:
+            reply = dict(error=f'Invalid request: {ex}')
+        except OSError:
+            # The client is gone.
+            return
+
+        try:
+            self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    """Run the daemon; return 0 when stopped, or 2 on errors."""
+    parser = argparse.ArgumentParser(
+        description='Answer update checks over a local Unix socket.',
+    )
+    parser.add_argument(
+        '--socket',
+        required=True,
+        dest='socketPath',
+        metavar='PATH',
+        help='path to the Unix socket to listen on.',
+    )
+    parser.add_argument(
+        '--cache',
+        default=DAEMON_CACHE,
+        metavar='FILE',
+        help='path to the version cache file.',
+    )
+    parser.add_argument(
+        '--mode',
+        type=lambda text: int(text, 8),
+        default=None,
+        help='octal permissions of the socket, e.g. 660 '
+        '(default: 600, only the owner may connect).',
+    )
+    parser.add_argument(
+        '--group',
+        default=None,
+        help='group owning the socket; with --mode 660, '
+        'its members may connect.',
+    )
+    parser.add_argument(
+        '--ttl',
+        type=int,
+        default=None,
+        help='maximum age in seconds of a cached entry.',
+    )
+    parser.add_argument(
+        '--refresh',
+        type=float,
+        default=None,
+        help='time in seconds between background refreshes.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='maximum number of concurrent lookups.',
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='deadline of a query in seconds.',
+    )
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print('Unix sockets are not supported on this platform.')
+        return 2
+
+    updateDaemon = UpdateDaemon(
+        args.socketPath,
+        VersionCache(args.cache, ttl=args.ttl),
+        maxWorkers=args.workers,
+        timeout=args.timeout,
+        refreshInterval=args.refresh,
+        socketMode=args.mode,
+        socketGroup=args.group,
+    )
+
+    def terminate(signum, frame):
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+    try:
+        updateDaemon.serve_forever()
+    except OSError as ex:
+        print(ex)
+        return 2
+
+    except KeyError:
+        print(f'Unknown group: {args.group}')
+        return 2
+
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,24 +4,66 @@ Copyright (c) 2025 Peter Triesberger
 For further information see https://github.com/peter88213/nv_updater
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
-import configparser
 from tkinter import ttk
-from urllib.request import urlopen
-import webbrowser
+import os
+import queue
+import threading
+import time
 
 from nvlib.controller.sub_controller import SubController
 from nvlib.gui.platform.platform_settings import KEYS
 from nvlib.gui.widgets.modal_dialog import ModalDialog
+from nvupdater.check_snapshot import CheckSnapshot
+from nvupdater.connection_pool import ConnectionPool
+from nvupdater.diagnostics_view import DiagnosticsView
+from nvupdater.download_manager import DownloadManager
+from nvupdater.download_manager import DownloadProgress
+from nvupdater.lookup_result import LookupResult
+from nvupdater.nvupdater_globals import DOWNLOAD_DIR
 from nvupdater.nvupdater_globals import HELP_PAGE
+from nvupdater.nvupdater_globals import HOME_DIR
 from nvupdater.nvupdater_locale import _
+from nvupdater.package_installer import PackageInstaller
+from nvupdater.release_notes_cache import ReleaseNotesCache
+from nvupdater.release_notes_loader import ReleaseNotesLoader
+from nvupdater.remote_data import RemoteData
+from nvupdater.update_checker import UpdateChecker
+from nvupdater.update_checker import collect_repositories
+from nvupdater.semantic_version import Version
+from nvupdater.semantic_version import update_available
+from nvupdater.update_resolver import get_api_version
+from nvupdater.update_resolver import resolve_update
 import tkinter as tk
 
 
 class UpdateManager(ModalDialog, SubController):
 
     MIN_HEIGHT = 500
-
-    def __init__(self, model, view, controller, **kw):
+    POLL_INTERVAL = 50
+    # milliseconds between two result queue checks
+    BATCH_SIZE = 50
+    # maximum number of results processed per queue check
+    SORT_ASCENDING = ' \u25b2'
+    SORT_DESCENDING = ' \u25bc'
+    # heading suffixes of the sort column
+
+    OUTDATED = 'outdated'
+    FAILED = 'failed'
+    CURRENT = 'current'
+    # row states
+
+    def __init__(
+            self,
+            model,
+            view,
+            controller,
+            prefs,
+            versionCache,
+            rateLimiter=None,
+            releaseNotesCache=None,
+            checkSnapshot=None,
+            **kw
+        ):
 
         def open_help_page(event=None):
             self._ctrl.open_help(page=HELP_PAGE)
@@ -36,13 +78,79 @@ class UpdateManager(ModalDialog, SubController):
         self.protocol("WM_DELETE_WINDOW", self.on_quit)
 
         self._downloadUrls = {}
+        self._checksums = {}
         self._download = False
+        self._downloadManager = DownloadManager(
+            DOWNLOAD_DIR,
+            maxWorkers=int(prefs['download_workers']),
+            timeout=float(prefs['read_timeout']),
+        )
+        self._downloadPollId = None
+        self._downloadProgress = {}
+        self._downloadCount = 0
+        self._installResults = queue.Queue()
+        # the installation results, posted by the worker thread
         self._stopSearching = False
-
-        treeWindow = ttk.Frame(self)
-        treeWindow.pack(fill='both', expand=True)
+        self._updateChecker = UpdateChecker(
+            prefs,
+            versionCache=versionCache,
+            rateLimiter=rateLimiter,
+        )
+        if releaseNotesCache is None:
+            releaseNotesCache = ReleaseNotesCache()
+        self._releaseNotes = ReleaseNotesLoader(
+            RemoteData(
+                connectionPool=ConnectionPool(
+                    connectTimeout=float(prefs['connect_timeout']),
+                    readTimeout=float(prefs['read_timeout']),
+                    rateLimiter=self._updateChecker.rateLimiter,
+                ),
+                retries=int(prefs['retries']),
+            ),
+            releaseNotesCache,
+        )
+        self._checkSnapshot = checkSnapshot
+        self._notesPollId = None
+        self._notesRequests = {}
+        # (repository URL, installed version, update) by component name
+        self._notes = {}
+        # loaded release notes by component name;
+        # kept, because the shared cache may drop them
+        self._notesErrors = {}
+        # download errors by component name
+        self._repoUrls = {}
+        self._beta = prefs.get('beta_channel', False)
+        self._pollId = None
+        self._currentVersions = {}
+        self._latestVersions = {}
+        self._found = False
+        self._rateLimitError = None
+        # the last error of a lookup refused due to a rate limit
+        self._apiVersion = None
+        self._plannedApiVersion = None
+        # (major, minor) versions of the installed and the planned novelibre
+        self._waitingResults = None
+        # plugin results received before novelibre's; None when resolved
+
+        self._rowOrder = []
+        # repository names in display order, including detached rows
+        self._rowStates = {}
+        # row states by repository name; rows not checked yet are missing
+        self._pendingRows = {}
+        # (values, tags) by repository name, to be applied in one batch
+        self._rowValues = {}
+        # (values, tags) by repository name, as displayed
+        self._sortColumn = None
+        self._sortDescending = False
+        self._outdatedOnly = tk.BooleanVar(value=False)
+
+        panes = ttk.PanedWindow(self, orient='horizontal')
+        panes.pack(fill='both', expand=True)
+        treeWindow = ttk.Frame(panes)
+        panes.add(treeWindow, weight=1)
 
         columns = 'Component', 'Installed version', 'Latest version'
+        self._columns = columns
         self._repoList = ttk.Treeview(
             treeWindow,
             columns=columns,
@@ -63,6 +171,7 @@ class UpdateManager(ModalDialog, SubController):
         self._repoList.tag_configure('outdated', foreground='red')
         self._repoList.tag_configure('updated', foreground='blue')
         self._repoList.tag_configure('inactive', foreground='gray')
+        self._repoList.tag_configure('stale', foreground='gray')
 
         self._repoList.column(
             'Component',
@@ -74,6 +183,7 @@ class UpdateManager(ModalDialog, SubController):
             'Component',
             text=_('Component'),
             anchor='w',
+            command=lambda: self._sort_by('Component'),
         )
         self._repoList.column(
             'Installed version',
@@ -85,6 +195,7 @@ class UpdateManager(ModalDialog, SubController):
             'Installed version',
             text=_('Installed version'),
             anchor='w',
+            command=lambda: self._sort_by('Installed version'),
         )
         self._repoList.column(
             'Latest version',
@@ -96,7 +207,27 @@ class UpdateManager(ModalDialog, SubController):
             'Latest version',
             text=_('Latest version'),
             anchor='w',
+            command=lambda: self._sort_by('Latest version'),
+        )
+
+        # Release notes panel.
+        notesWindow = ttk.Frame(panes)
+        panes.add(notesWindow, weight=1)
+        ttk.Label(
+            notesWindow,
+            text=_('Release notes'),
+        ).pack(anchor='w', padx=5)
+        notesScrollY = ttk.Scrollbar(notesWindow, orient='vertical')
+        self._notesView = tk.Text(
+            notesWindow,
+            width=40,
+            wrap='word',
+            state='disabled',
+            yscrollcommand=notesScrollY.set,
         )
+        notesScrollY.configure(command=self._notesView.yview)
+        notesScrollY.pack(side='right', fill='y')
+        self._notesView.pack(fill='both', expand=True)
 
         self._messagingArea = tk.Label(self, fg='white', bg='green')
         self._messagingArea.pack(fill='x')
@@ -113,6 +244,15 @@ class UpdateManager(ModalDialog, SubController):
         )
         self._updateButton.pack(padx=5, pady=5, side='left')
 
+        # "Update all" button.
+        self._updateAllButton = ttk.Button(
+            footer,
+            text=_('Update all'),
+            command=self._update_all,
+            state='disabled',
+        )
+        self._updateAllButton.pack(padx=5, pady=5, side='left')
+
         # "Home page" button.
         self._homeButton = ttk.Button(
             footer,
@@ -122,6 +262,21 @@ class UpdateManager(ModalDialog, SubController):
         )
         self._homeButton.pack(padx=5, pady=5, side='left')
 
+        # "Outdated only" filter.
+        ttk.Checkbutton(
+            footer,
+            text=_('Outdated only'),
+            variable=self._outdatedOnly,
+            command=self._arrange_rows,
+        ).pack(padx=5, pady=5, side='left')
+
+        # "Details" button.
+        ttk.Button(
+            footer,
+            text=_('Details'),
+            command=self._show_details,
+        ).pack(padx=5, pady=5, side='left')
+
         # "Close" button.
         ttk.Button(
             footer,
@@ -144,99 +299,41 @@ class UpdateManager(ModalDialog, SubController):
         self._build_module_list()
 
     def check_repos(self):
-        """Check the repositories and update the view.
+        """Start checking the repositories and return immediately.
         
-        Add the URLs to download from to the downloadUrls dictionary.
+        The lookups run in the background; the view is updated
+        by _process_results(), which is called periodically
+        by the Tk main loop.
         """
         self._output(f"{_('Looking for updates')}...")
-        found = False
-
-        # Check novelibre.
-        repoName = 'novelibre'
-        current = (
-            self._ctrl.plugins.majorVersion,
-            self._ctrl.plugins.minorVersion,
-            self._ctrl.plugins.patchlevel,
+        self._currentVersions, repoUrls = collect_repositories(
+            self._ctrl.plugins
         )
-        currentStr = (
-            f'{self._ctrl.plugins.majorVersion}.'
-            f'{self._ctrl.plugins.minorVersion}.'
-            f'{self._ctrl.plugins.patchlevel}'
-        )
-        try:
-            (majorVersion,
-             minorVersion,
-             patchlevel,
-             downloadUrl) = self._get_remote_data(repoName)
-        except:
-            latestStr = _('unknown')
-            tags = ()
-        else:
-            latest = (majorVersion, minorVersion, patchlevel)
-            latestStr = f'{majorVersion}.{minorVersion}.{patchlevel}'
-            if self._update_available(latest, current):
-                self._downloadUrls[repoName] = downloadUrl
-                tags = ('outdated')
-                found = True
-            else:
-                tags = ()
-        self._refresh_display(
-            repoName,
-            [repoName, currentStr, latestStr],
-            tags=tags,
-        )
-
-        # Check installed plugins.
-        for repoName in self._ctrl.plugins:
-            if self._stopSearching:
-                return
-
-            if self._ctrl.plugins[repoName].isRejected:
-                continue
-
-            try:
-                (majorVersion,
-                 minorVersion,
-                 patchlevel) = self._ctrl.plugins[repoName].VERSION.split('.')
-                current = (
-                    int(majorVersion),
-                    int(minorVersion),
-                    int(patchlevel),
-                )
-                currentStr = f'{majorVersion}.{minorVersion}.{patchlevel}'
-            except:
-                current = (0, 0, 0)
-                currentStr = _('unknown')
-            try:
-                (majorVersion,
-                 minorVersion,
-                 patchlevel,
-                 downloadUrl) = self._get_remote_data(repoName)
-                latest = (majorVersion, minorVersion, patchlevel)
-                latestStr = f'{majorVersion}.{minorVersion}.{patchlevel}'
-            except:
-                latestStr = _('unknown')
-                tags = ()
-            else:
-                if self._update_available(latest, current):
-                    self._downloadUrls[repoName] = downloadUrl
-                    tags = ('outdated')
-                    found = True
-                else:
-                    tags = ()
-            self._refresh_display(
-                repoName,
-                [repoName, currentStr, latestStr],
-                tags=tags,
-                )
-        if not found:
-            self._output(f"{_('No updates available')}.")
-        else:
-            self._output(f"{_('Finished')}.")
+        self._repoUrls = repoUrls
+        self._found = False
+        self._apiVersion = get_api_version(self._currentVersions['novelibre'])
+        self._plannedApiVersion = self._apiVersion
+        self._waitingResults = []
+        self._updateChecker.start(repoUrls)
+        self._pollId = self.after(self.POLL_INTERVAL, self._process_results)
 
     def on_quit(self):
         """Display a warning if something might have been updated."""
         self._stopSearching = True
+        self._updateChecker.stop()
+        self._downloadManager.stop()
+        self._releaseNotes.stop()
+        if self._notesPollId is not None:
+            self.after_cancel(self._notesPollId)
+            self._notesPollId = None
+        if self._pollId is not None:
+            self.after_cancel(self._pollId)
+            self._pollId = None
+        if self._downloadPollId is not None:
+            self.after_cancel(self._downloadPollId)
+            self._downloadPollId = None
+        if self._checkSnapshot is not None:
+            self._checkSnapshot.write()
         if self._download:
             self._ui.show_info(
                 message=_('Please restart novelibre after installing updates'),
@@ -249,8 +346,15 @@ class UpdateManager(ModalDialog, SubController):
     def _build_module_list(self):
         # Populate _repoList with repository entries.
         # Prepare the downloadUrls dictionary for repositories to update from.
+        # The latest versions are taken from the last check's snapshot,
+        # if any, until the current check's results arrive.
+        currentVersions, __ = collect_repositories(self._ctrl.plugins)
         repoName = 'novelibre'
         self._downloadUrls[repoName] = None
+        latestVersion, nodeTags = self._get_snapshot_values(
+            repoName,
+            currentVersions[repoName],
+        )
         appValues = [
             repoName,
             (
@@ -258,60 +362,161 @@ class UpdateManager(ModalDialog, SubController):
                 f'{self._ctrl.plugins.minorVersion}.'
                 f'{self._ctrl.plugins.patchlevel}'
             ),
-            f"{_('wait')} ...",
+            latestVersion,
             ]
-        self._repoList.insert('', 'end', 'novelibre', values=appValues)
+        self._repoList.insert(
+            '', 'end',
+            'novelibre',
+            values=appValues,
+            tags=nodeTags,
+        )
+        self._rowValues[repoName] = (appValues, nodeTags)
+        self._rowOrder.append(repoName)
 
         for repoName in self._ctrl.plugins:
             if self._ctrl.plugins[repoName].isRejected:
                 continue
 
             self._downloadUrls[repoName] = None
-            nodeTags = []
             try:
                 installedVersion = self._ctrl.plugins[repoName].VERSION
             except AttributeError:
                 installedVersion = _('unknown')
-            latestVersion = f"{_('wait')} ..."
+            latestVersion, nodeTags = self._get_snapshot_values(
+                repoName,
+                currentVersions[repoName],
+            )
             columns = [repoName, installedVersion, latestVersion]
             if not self._ctrl.plugins[repoName].isActive:
-                nodeTags.append('inactive')
+                nodeTags = ('inactive',)
                 # Mark loaded yet incompatible downloadUrls.
             self._repoList.insert(
                 '', 'end',
                 repoName,
                 values=columns,
-                tags=tuple(nodeTags),
+                tags=nodeTags,
             )
-        self.update()
-        # enforcing the display before returning
-        # to the time-consuming internet lookup
-
-    def _get_remote_data(self, repoName):
-        # Return a tuple with the version number components
-        # and the download URL.
-        if repoName == 'novelibre':
-            repoUrl = 'https://github.com/peter88213/novelibre'
+            self._rowValues[repoName] = (columns, nodeTags)
+            self._rowOrder.append(repoName)
+
+    def _arrange_rows(self):
+        # Attach the visible rows in display order and detach the others.
+        # With the "Outdated only" filter set, only outdated
+        # and failed rows are visible.
+        outdatedOnly = self._outdatedOnly.get()
+        index = 0
+        for repoName in self._rowOrder:
+            if outdatedOnly and self._rowStates.get(repoName, None) not in (
+                self.OUTDATED,
+                self.FAILED,
+            ):
+                self._repoList.detach(repoName)
+            else:
+                self._repoList.move(repoName, '', index)
+                index += 1
+
+    def _get_snapshot_values(self, repoName, current):
+        # Return a tuple (latest version column text, tags) for a row
+        # of the last check's snapshot.
+        # Stale rows are dated and grayed out. Fresh rows of outdated
+        # components can be updated right away.
+        row = None
+        if self._checkSnapshot is not None:
+            row = self._checkSnapshot.get(repoName)
+        if row is None:
+            return f"{_('wait')} ...", ()
+
+        try:
+            if row['latest'] is None:
+                latest = None
+            else:
+                latest = Version.parse(row['latest'])
+        except (KeyError, TypeError, ValueError):
+            return f"{_('wait')} ...", ()
+
+        if current is not None:
+            current = str(current)
+        isOutdated = row.get('status', None) == CheckSnapshot.OUTDATED
+        if latest is None:
+            latestStr = _('unknown')
         else:
-            repoUrl = self._ctrl.plugins[repoName].URL
-        versionUrl = f'{repoUrl}/raw/main/VERSION'
-        data = urlopen(versionUrl)
-        versionInfo = data.read().decode('utf-8')
-        config = configparser.ConfigParser()
-        config.read_string(versionInfo)
-        downloadUrl = config['LATEST']['download_link']
-        version = config['LATEST']['version']
-        majorVersion, minorVersion, patchlevel = version.split('.')
-        return (
-            int(majorVersion),
-            int(minorVersion),
-            int(patchlevel),
-            downloadUrl
+            latestStr = str(latest)
+            self._latestVersions[repoName] = latest
+        if self._checkSnapshot.is_stale(row, current):
+            checked = time.strftime(
+                '%Y-%m-%d %H:%M',
+                time.localtime(row.get('checked', 0)),
+            )
+            return f"{latestStr} ({_('as of')} {checked})", ('stale',)
+
+        if isOutdated:
+            self._rowStates[repoName] = self.OUTDATED
+            self._downloadUrls[repoName] = row.get('download_link', None)
+            self._checksums[repoName] = row.get('sha256', None)
+            return latestStr, ('outdated',)
+
+        self._rowStates[repoName] = self.CURRENT
+        return latestStr, ()
+
+    def _get_rate_limit_message(self):
+        # Return a message naming the blocked hosts and their reset times.
+        text = _('The request quota is exhausted')
+        blockedHosts = self._updateChecker.rateLimiter.get_blocked_hosts()
+        if not blockedHosts:
+            retryAt = getattr(self._rateLimitError, 'retryAt', None)
+            if retryAt is None:
+                return f'{text}.'
+
+            retryTime = time.strftime('%H:%M', time.localtime(retryAt))
+            return f"{text}; {_('please try again after')} {retryTime}."
+
+        hosts = []
+        for host, retryAt in sorted(blockedHosts.items()):
+            retryTime = time.strftime('%H:%M', time.localtime(retryAt))
+            hosts.append(f"{host} {_('until')} {retryTime}")
+        return f"{text}: {', '.join(hosts)}."
+
+    def _install(self, archives):
+        # Worker thread: install the plugin packages; post the results.
+        installer = PackageInstaller(f'{HOME_DIR}/.novx')
+        results = installer.install_all(archives)
+        for repoName, result in results.items():
+            if not isinstance(result, Exception):
+                try:
+                    os.remove(archives[repoName])
+                except OSError:
+                    pass
+        self._installResults.put(results)
+
+    def _install_downloads(self):
+        # Install the downloaded plugin packages in one batch
+        # on a worker thread. novelibre itself is left
+        # in the staging directory.
+        archives = {}
+        for progress in self._downloadProgress.values():
+            if (
+                progress.status == DownloadProgress.DONE
+                and progress.repoName != 'novelibre'
+            ):
+                archives[progress.repoName] = progress.filePath
+        self._output(f"{_('Installing')} ...")
+        threading.Thread(
+            target=self._install,
+            args=(archives,),
+            name='nv_updater_install',
+            daemon=True,
+        ).start()
+        self._downloadPollId = self.after(
+            self.POLL_INTERVAL,
+            self._process_installation,
         )
 
     def _on_select_plugin(self, event):
         # Enable or disable the selected repo's "Update" and "Home" buttons.
-        repoName = self._repoList.selection()[0]
+        try:
+            repoName = self._repoList.selection()[0]
+        except IndexError:
+            repoName = None
         homeButtonState = 'disabled'
         updateButtonState = 'disabled'
         if repoName:
@@ -334,9 +539,12 @@ class UpdateManager(ModalDialog, SubController):
                     pass
         self._homeButton.configure(state=homeButtonState)
         self._updateButton.configure(state=updateButtonState)
+        self._show_release_notes(repoName)
 
     def _open_homepage(self, event=None):
         # Start the web browser with the selected module's home page.
+        import webbrowser
+
         repoName = self._repoList.selection()[0]
         if repoName:
             if repoName == 'novelibre':
@@ -356,34 +564,342 @@ class UpdateManager(ModalDialog, SubController):
         except:
             pass
 
-    def _refresh_display(self, repoName, values, tags=()):
-        # Update the version numbers and colors of an entry in the _repoList.
+    def _process_results(self):
+        # Apply the lookup results received so far to the view.
+        # Reschedule itself until the check is finished.
+        self._pollId = None
+        if self._stopSearching:
+            return
+
+        finished = False
+        for item in self._updateChecker.get_results(self.BATCH_SIZE):
+            if item is None:
+                finished = True
+                break
+
+            self._show_result(item)
+        if finished and self._waitingResults:
+            # There is no novelibre result; resolve for the installed version.
+            self._resolve_waiting_results()
+        self._refresh_display()
+        if finished:
+            self._stopSearching = True
+            if self._checkSnapshot is not None:
+                self._checkSnapshot.write()
+            if self._found:
+                message = f"{_('Finished')}."
+                self._updateAllButton.configure(state='normal')
+            else:
+                message = f"{_('No updates available')}."
+            if self._rateLimitError is not None:
+                message = f'{message} {self._get_rate_limit_message()}'
+            self._output(message)
+            return
+
+        self._pollId = self.after(self.POLL_INTERVAL, self._process_results)
+
+    def _process_release_notes(self):
+        # Show the release notes of the selected component, once loaded.
+        # Reschedule itself while downloads are pending.
+        self._notesPollId = None
         try:
+            selection = self._repoList.selection()[0]
+        except IndexError:
+            selection = None
+        # The results are queued before a download counts as finished,
+        # so if nothing is running now, the loop below gets them all.
+        isRunning = self._releaseNotes.is_running()
+        for result in self._releaseNotes.get_results():
+            if result.status == LookupResult.OK:
+                self._notes[result.repoName] = result.data
+            else:
+                self._notesErrors[result.repoName] = result.error
+            if result.repoName == selection:
+                self._show_release_notes(selection)
+        if isRunning:
+            self._notesPollId = self.after(
+                self.POLL_INTERVAL,
+                self._process_release_notes,
+            )
+
+    def _process_downloads(self):
+        # Show the download progress; mark the downloaded components.
+        # Reschedule itself until the downloads are finished.
+        self._downloadPollId = None
+        finished = False
+        for progress in self._downloadManager.get_results():
+            if progress is None:
+                finished = True
+                break
+
+            self._downloadProgress[progress.repoName] = progress
+            if progress.status == DownloadProgress.DONE:
+                self._repoList.item(progress.repoName, tags=('updated'))
+                self._download = True
+        if finished:
+            self._install_downloads()
+            return
+
+        done = 0
+        verified = 0
+        received = 0
+        total = 0
+        for progress in self._downloadProgress.values():
+            if progress.status == DownloadProgress.DONE:
+                done += 1
+                if progress.verified:
+                    verified += 1
+            received += progress.received
+            if progress.total is None or total is None:
+                total = None
+            else:
+                total += progress.total
+        text = f"{_('Downloading')}: {done}/{self._downloadCount}"
+        if verified:
+            text = f"{text}, {_('checksum verified')}: {verified}"
+        if total:
+            text = f'{text} ({received * 100 // total}%)'
+        self._output(text)
+        self._downloadPollId = self.after(
+            self.POLL_INTERVAL,
+            self._process_downloads,
+        )
+
+    def _process_installation(self):
+        # Show the installation results, once available.
+        # Reschedule itself until the installation is finished.
+        self._downloadPollId = None
+        try:
+            results = self._installResults.get_nowait()
+        except queue.Empty:
+            self._downloadPollId = self.after(
+                self.POLL_INTERVAL,
+                self._process_installation,
+            )
+            return
+
+        failed = []
+        installed = []
+        staged = []
+        for progress in self._downloadProgress.values():
+            if progress.status != DownloadProgress.DONE:
+                failed.append(progress.repoName)
+            elif progress.repoName == 'novelibre':
+                staged.append(progress.repoName)
+        for repoName, result in results.items():
+            if isinstance(result, Exception):
+                failed.append(repoName)
+            else:
+                installed.append(repoName)
+        messages = []
+        if installed:
+            messages.append(f"{_('Installed')}: {', '.join(sorted(installed))}")
+        if staged:
+            messages.append(
+                f"{_('Downloaded to')} {self._downloadManager.stagingDir}: "
+                f"{', '.join(staged)}"
+            )
+        if failed:
+            messages.append(
+                f"{_('Update failed')}: {', '.join(sorted(failed))}"
+            )
+        self._output('. '.join(messages))
+        self._updateAllButton.configure(state='normal')
+
+    def _refresh_display(self):
+        # Apply the pending row updates to the _repoList in one batch.
+        if not self._pendingRows:
+            return
+
+        for repoName, (values, tags) in self._pendingRows.items():
             self._repoList.item(repoName, values=values, tags=tags)
-            self.update()
-        except:
-            pass
-            # preventing an error due to pending checks
-            # while the window is already closed
+            self._rowValues[repoName] = (values, tags)
+        self._pendingRows = {}
+        if self._sortColumn is not None:
+            self._sort_rows()
+        if self._sortColumn is not None or self._outdatedOnly.get():
+            self._arrange_rows()
+
+    def _request_release_notes(self, repoName, current, update):
+        # Prefetch the release notes of an outdated component.
+        repoUrl = self._repoUrls.get(repoName, None)
+        if not repoUrl:
+            return
 
-    def _update_available(self, latest, current):
-        # Return True, if the latest version number is greater
-        # than the current one.
-        if latest[0] > current[0]:
-            return True
+        self._notesRequests[repoName] = (repoUrl, current, update)
+        self._notesErrors.pop(repoName, None)
+        notes = self._releaseNotes.get(repoUrl, current, update)
+        if notes is not None:
+            self._notes[repoName] = notes
+            return
 
-        if latest[0] == current[0]:
-            if latest[1] > current[1]:
-                return True
+        self._notes.pop(repoName, None)
+        if self._releaseNotes.request(repoName, repoUrl, current, update):
+            if self._notesPollId is None:
+                self._notesPollId = self.after(
+                    self.POLL_INTERVAL,
+                    self._process_release_notes,
+                )
+
+    def _resolve_waiting_results(self):
+        # Show the plugin results that have been waiting for novelibre's.
+        waitingResults = self._waitingResults
+        self._waitingResults = None
+        for result in waitingResults:
+            self._show_result(result)
+
+    def _show_details(self):
+        # Open a window listing the lookup timings, slowest first.
+        DiagnosticsView(self, list(self._updateChecker.timings))
+
+    def _show_release_notes(self, repoName):
+        # Display the release notes of a component in the side panel.
+        request = self._notesRequests.get(repoName, None)
+        if request is None:
+            text = ''
+        else:
+            notes = self._notes.get(repoName, None)
+            if notes is None:
+                notes = self._releaseNotes.get(*request)
+            if notes:
+                text = notes
+            elif notes is not None:
+                text = _('No release notes available')
+            elif repoName in self._notesErrors:
+                text = (
+                    f"{_('No release notes available')}:\n"
+                    f'{self._notesErrors[repoName]}'
+                )
+            else:
+                text = f"{_('Loading release notes')} ..."
+        self._notesView.configure(state='normal')
+        self._notesView.delete('1.0', 'end')
+        self._notesView.insert('end', text)
+        self._notesView.configure(state='disabled')
+
+    def _show_result(self, result):
+        # Choose the release to update to, and display the result.
+        # Plugins are resolved after novelibre, because a novelibre update
+        # may enable newer plugin releases.
+        repoName = result.repoName
+        if repoName != 'novelibre' and self._waitingResults is not None:
+            self._waitingResults.append(result)
+            return
+
+        self._downloadUrls[repoName] = None
+        # may have been set from the snapshot
+        current = self._currentVersions[repoName]
+        if current is None:
+            currentStr = _('unknown')
+        else:
+            currentStr = str(current)
+        if result.status == LookupResult.TIMED_OUT:
+            latestStr = _('timed out')
+            tags = ()
+            self._rowStates[repoName] = self.FAILED
+        elif result.status == LookupResult.RATE_LIMITED:
+            latestStr = _('rate limited')
+            tags = ()
+            self._rowStates[repoName] = self.FAILED
+            self._rateLimitError = result.error
+        elif result.status != LookupResult.OK:
+            latestStr = _('unknown')
+            tags = ()
+            self._rowStates[repoName] = self.FAILED
+        else:
+            resolution = resolve_update(
+                result.data,
+                current,
+                apiVersion=self._apiVersion,
+                plannedApiVersion=self._plannedApiVersion,
+                beta=self._beta,
+            )
+            if self._checkSnapshot is not None:
+                self._checkSnapshot.store_resolution(
+                    repoName,
+                    current,
+                    resolution,
+                )
+            update = resolution.update
+            if update is not None:
+                self._latestVersions[repoName] = update.version
+                latestStr = str(update.version)
+                if resolution.needsNovelibre:
+                    latestStr = (
+                        f"{latestStr} ({_('requires')} novelibre "
+                        f"{'.'.join(str(n) for n in update.apiVersion)})"
+                    )
+                self._downloadUrls[repoName] = update.downloadLink
+                self._checksums[repoName] = update.sha256
+                self._request_release_notes(repoName, current, update.version)
+                tags = ('outdated',)
+                self._found = True
+                self._rowStates[repoName] = self.OUTDATED
+                if repoName == 'novelibre':
+                    self._plannedApiVersion = get_api_version(update.version)
+            elif resolution.latest is not None:
+                latest = resolution.latest.version
+                self._latestVersions[repoName] = latest
+                latestStr = str(latest)
+                tags = ()
+                if update_available(latest, current, beta=self._beta):
+                    latestStr = f"{latestStr} ({_('incompatible')})"
+                    tags = ('inactive',)
+                self._rowStates[repoName] = self.CURRENT
+            else:
+                latestStr = _('unknown')
+                tags = ()
+                self._rowStates[repoName] = self.CURRENT
+        row = ([repoName, currentStr, latestStr], tags)
+        if row != self._rowValues.get(repoName, None):
+            # Only changed rows are redrawn.
+            self._pendingRows[repoName] = row
+        elif repoName in self._pendingRows:
+            del self._pendingRows[repoName]
+        if repoName == 'novelibre' and self._waitingResults is not None:
+            self._resolve_waiting_results()
+
+    def _sort_by(self, column):
+        # Sort the rows by column; toggle the direction on repeated clicks.
+        if column == self._sortColumn:
+            self._sortDescending = not self._sortDescending
+        else:
+            self._sortColumn = column
+            self._sortDescending = False
+        for heading in self._columns:
+            text = _(heading)
+            if heading == column:
+                if self._sortDescending:
+                    text = f'{text}{self.SORT_DESCENDING}'
+                else:
+                    text = f'{text}{self.SORT_ASCENDING}'
+            self._repoList.heading(heading, text=text)
+        self._sort_rows()
+        self._arrange_rows()
+
+    def _sort_key(self, repoName):
+        # Return the sort key of a row for the current sort column.
+        # Unknown versions sort first.
+        if self._sortColumn == 'Component':
+            return repoName.lower()
+
+        if self._sortColumn == 'Installed version':
+            version = self._currentVersions.get(repoName, None)
+        else:
+            version = self._latestVersions.get(repoName, None)
+        if version is None:
+            return (False, ())
 
-            if latest[1] == current[1]:
-                if latest[2] > current[2]:
-                    return True
+        return (True, version.key)
 
-        return False
+    def _sort_rows(self):
+        # Reorder _rowOrder by the sort column; detached rows included.
+        self._rowOrder.sort(key=self._sort_key, reverse=self._sortDescending)
 
     def _update_module(self, event=None):
         # Start the web browser with the selected module's update URL.
+        import webbrowser
+
         repoName = self._repoList.selection()[0]
         if self._downloadUrls[repoName] is None:
             return
@@ -392,3 +908,27 @@ class UpdateManager(ModalDialog, SubController):
         self._repoList.item(repoName, tags=('updated'))
         self._download = True
 
+    def _update_all(self, event=None):
+        # Download the archives of all outdated components at once.
+        if self._downloadManager.is_running():
+            return
+
+        downloads = {}
+        for repoName, downloadUrl in self._downloadUrls.items():
+            if downloadUrl is not None:
+                downloads[repoName] = (
+                    downloadUrl,
+                    self._checksums.get(repoName, None),
+                )
+        if not downloads:
+            return
+
+        self._updateAllButton.configure(state='disabled')
+        self._downloadProgress = {}
+        self._downloadCount = len(downloads)
+        self._output(f"{_('Downloading')} ...")
+        self._downloadManager.start(downloads)
+        self._downloadPollId = self.after(
+            self.POLL_INTERVAL,
+            self._process_downloads,
+        )
@@ -0,0 +1,143 @@
+"""Provide functions for choosing the releases to update to.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from nvupdater.semantic_version import update_available
+
+
+class Resolution:
+    """The outcome of resolving the update of a component."""
+    __slots__ = ('update', 'latest', 'needsNovelibre')
+
+    def __init__(self, update, latest, needsNovelibre=False):
+        """Store the outcome.
+
+        Positional arguments:
+            update: VersionInfo -- the release to update to, or None.
+            latest: VersionInfo -- the newest release of the channel, or None.
+
+        Optional arguments:
+            needsNovelibre: bool -- True if the update requires
+                                    the planned novelibre update.
+        """
+        self.update = update
+        self.latest = latest
+        self.needsNovelibre = needsNovelibre
+
+
+def get_api_version(version):
+    """Return a (major, minor) tuple for a Version instance, or None."""
+    if version is None:
+        return None
+
+    return version.major, version.minor
+
+
+def is_compatible(release, apiVersion):
+    """Return True if the release works with the novelibre API version.
+
+    Positional arguments:
+        release: VersionInfo -- the release to check.
+        apiVersion: tuple -- (major, minor) version of novelibre,
+                             or None if unknown.
+
+    As with novelibre's plugin check, the major versions must match,
+    and the required minor version must not be higher.
+    Releases without an API requirement are considered compatible.
+    """
+    if release.apiVersion is None or apiVersion is None:
+        return True
+
+    major, minor = release.apiVersion
+    return major == apiVersion[0] and minor <= apiVersion[1]
+
+
+def resolve_update(
+        releases,
+        current,
+        apiVersion=None,
+        plannedApiVersion=None,
+        beta=False,
+    ):
+    """Return a Resolution instance for a component's releases.
+
+    Positional arguments:
+        releases: list -- VersionInfo instances, newest first.
+        current: Version -- the installed version, or None if unknown.
+
+    Optional arguments:
+        apiVersion: tuple -- (major, minor) version of the installed novelibre.
+        plannedApiVersion: tuple -- (major, minor) version of novelibre
+                                    after the planned update, if any.
+        beta: bool -- if True, pre-releases are considered.
+
+    The update is the newest release of the channel that is newer than
+    the installed version and compatible with the planned novelibre,
+    or with the installed one if no novelibre update is planned.
+    The releases are looked at in one pass.
+    """
+    if plannedApiVersion is None:
+        plannedApiVersion = apiVersion
+    latest = None
+    for release in releases:
+        if release.version.isPrerelease and not beta:
+            continue
+
+        if latest is None:
+            latest = release
+        if not update_available(release.version, current, beta=beta):
+            # The releases are sorted, so no update will follow.
+            break
+
+        if is_compatible(release, plannedApiVersion):
+            return Resolution(
+                release,
+                latest,
+                needsNovelibre=not is_compatible(release, apiVersion),
+            )
+
+    return Resolution(None, latest)
+
+
+def plan_updates(releasesByRepo, currentVersions, beta=False):
+    """Return a dictionary of Resolution instances by repository name.
+
+    Positional arguments:
+        releasesByRepo: dict -- lists of VersionInfo instances, newest first,
+                                by repository name.
+        currentVersions: dict -- installed Version instances, or None,
+                                 by repository name, including novelibre.
+
+    Optional arguments:
+        beta: bool -- if True, pre-releases are considered.
+
+    novelibre is resolved first. If it is updated, the plugins
+    are resolved for the new novelibre version.
+    """
+    current = currentVersions.get('novelibre', None)
+    apiVersion = get_api_version(current)
+    plannedApiVersion = apiVersion
+    plan = {}
+    if 'novelibre' in releasesByRepo:
+        resolution = resolve_update(
+            releasesByRepo['novelibre'],
+            current,
+            beta=beta,
+        )
+        plan['novelibre'] = resolution
+        if resolution.update is not None:
+            plannedApiVersion = get_api_version(resolution.update.version)
+    for repoName, releases in releasesByRepo.items():
+        if repoName == 'novelibre':
+            continue
+
+        plan[repoName] = resolve_update(
+            releases,
+            currentVersions.get(repoName, None),
+            apiVersion=apiVersion,
+            plannedApiVersion=plannedApiVersion,
+            beta=beta,
+        )
+    return plan
@@ -6,17 +6,82 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 from nvlib.controller.services.service_base import ServiceBase
 from nvlib.gui.set_icon_tk import set_icon
+from nvupdater.check_scheduler import CheckScheduler
+from nvupdater.check_snapshot import CheckSnapshot
+from nvupdater.nvupdater_globals import CHECK_SNAPSHOT
+from nvupdater.nvupdater_globals import VERSION_CACHE
+from nvupdater.rate_limiter import RateLimiter
+from nvupdater.release_notes_cache import ReleaseNotesCache
 from nvupdater.update_manager import UpdateManager
+from nvupdater.version_cache import VersionCache
 
 
 class UpdateService(ServiceBase):
+    """Provide the update dialog and the background checks."""
 
-    def __init__(self, model, view, controller):
+    def __init__(self, model, view, controller, prefs):
         super().__init__(model, view, controller)
+        self.prefs = prefs
+        self.versionCache = VersionCache(
+            VERSION_CACHE,
+            ttl=int(self.prefs['cache_ttl']),
+        )
+        # Shared by all checks, so an exhausted quota is remembered.
+        self.rateLimiter = RateLimiter(rate=float(self.prefs['rate_limit']))
+        # Kept for the session; the size is bounded.
+        self.releaseNotesCache = ReleaseNotesCache()
+        # The last check's results, shown when the dialog opens.
+        self.checkSnapshot = CheckSnapshot(
+            CHECK_SNAPSHOT,
+            maxAge=int(self.prefs['cache_ttl']),
+        )
+        self.checkScheduler = None
+        self.updaterDialog = None
 
     def check_for_updates(self):
         """Check novelibre and all installed plugins for updates."""
-        self.updaterDialog = UpdateManager(self._mdl, self._ui, self._ctrl)
+        if self.checkScheduler is not None:
+            # Only one check at a time.
+            self.checkScheduler.cancel_check()
+            self.checkScheduler.isBlocked = True
+        self.updaterDialog = UpdateManager(
+            self._mdl,
+            self._ui,
+            self._ctrl,
+            self.prefs,
+            self.versionCache,
+            rateLimiter=self.rateLimiter,
+            releaseNotesCache=self.releaseNotesCache,
+            checkSnapshot=self.checkSnapshot,
+        )
+        self.updaterDialog.bind('<Destroy>', self._on_dialog_closed, add='+')
         set_icon(self.updaterDialog, icon='update', default=False)
         self.updaterDialog.check_repos()
 
+    def start_scheduler(self):
+        """Start periodic background checks."""
+        if self.checkScheduler is None:
+            self.checkScheduler = CheckScheduler(
+                self._mdl,
+                self._ui,
+                self._ctrl,
+                self.prefs,
+                self.versionCache,
+                rateLimiter=self.rateLimiter,
+                checkSnapshot=self.checkSnapshot,
+            )
+        self.checkScheduler.start()
+
+    def stop_scheduler(self):
+        """Stop periodic background checks."""
+        if self.checkScheduler is not None:
+            self.checkScheduler.stop()
+
+    def _on_dialog_closed(self, event):
+        # Resume the scheduled checks.
+        if event.widget is not self.updaterDialog:
+            return
+
+        self.updaterDialog = None
+        if self.checkScheduler is not None:
+            self.checkScheduler.isBlocked = False
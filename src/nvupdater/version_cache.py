@@ -0,0 +1,124 @@
+"""Provide a class for a persistent cache of remote version data.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import os
+import threading
+import time
+
+
+class VersionCache:
+    """Remote VERSION data, stored in a JSON file, keyed by repository URL.
+    
+    Each entry holds the version string, the download link,
+    the HTTP validators (ETag, Last-Modified), and the fetch time.
+    """
+    TTL = 3600
+    # default maximum age in seconds of an entry served without revalidation
+
+    def __init__(self, filePath, ttl=None):
+        """Read the cache file, if any.
+        
+        Positional arguments:
+            filePath: str -- path to the JSON cache file.
+        
+        Optional arguments:
+            ttl: int -- maximum age in seconds of a fresh entry.
+        """
+        self.filePath = filePath
+        if ttl is None or ttl < 0:
+            ttl = self.TTL
+        self.ttl = ttl
+        self._entries = {}
+        self._changed = False
+        self._lock = threading.Lock()
+        self.read()
+
+    def get(self, repoUrl):
+        """Return a copy of the entry for repoUrl, or None."""
+        with self._lock:
+            entry = self._entries.get(repoUrl, None)
+            if entry is None:
+                return None
+
+            return dict(entry)
+
+    def is_fresh(self, entry):
+        """Return True if entry can be used without revalidation."""
+        return time.time() - entry.get('fetched', 0) < self.ttl
+
+    def read(self):
+        """Load the entries from the cache file.
+        
+        A missing or corrupt file results in an empty cache.
+        """
+        try:
+            with open(self.filePath, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        if not isinstance(entries, dict):
+            entries = {}
+        with self._lock:
+            self._entries = entries
+            self._changed = False
+
+    def store(
+            self,
+            repoUrl,
+            version,
+            downloadUrl,
+            etag=None,
+            lastModified=None,
+            extra=None,
+        ):
+        """Add or replace the entry for repoUrl.
+        
+        Optional arguments:
+            etag: str -- the ETag response header.
+            lastModified: str -- the Last-Modified response header.
+            extra: dict -- additional data to store with the entry.
+        """
+        entry = dict(
+            version=version,
+            download_link=downloadUrl,
+            etag=etag,
+            last_modified=lastModified,
+            fetched=time.time(),
+        )
+        if extra:
+            entry.update(extra)
+        with self._lock:
+            self._entries[repoUrl] = entry
+            self._changed = True
+
+    def touch(self, repoUrl):
+        """Mark the entry for repoUrl as revalidated."""
+        with self._lock:
+            if repoUrl in self._entries:
+                self._entries[repoUrl]['fetched'] = time.time()
+                self._changed = True
+
+    def write(self):
+        """Save the entries to the cache file, if changed.
+        
+        The file is replaced atomically.
+        Errors are ignored, because the cache is not essential.
+        """
+        with self._lock:
+            if not self._changed:
+                return
+
+            entries = json.dumps(self._entries, indent=1)
+            self._changed = False
+        tempPath = f'{self.filePath}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.filePath), exist_ok=True)
+            with open(tempPath, 'w', encoding='utf-8') as f:
+                f.write(entries)
+            os.replace(tempPath, self.filePath)
+        except OSError:
+            pass
@@ -0,0 +1,109 @@
+"""Provide a class for an aggregated index of latest versions.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import configparser
+import json
+import threading
+from urllib.parse import urlsplit
+
+
+class VersionIndex:
+    """Latest version data of many repositories in a single document.
+    
+    The document is read once, on first access, from a URL
+    or a local file. It is either JSON:
+    
+    {"<repository URL>": {"version": "x.y.z", "download_link": "<URL>"}, ...}
+    
+    or INI with a section per repository URL:
+    
+    [<repository URL>]
+    version = x.y.z
+    download_link = <URL>
+    
+    As in VERSION files, an entry may have the optional
+    sha256 and api_version keys.
+    """
+    REQUIRED_KEYS = ('version', 'download_link')
+    OPTIONAL_KEYS = ('sha256', 'api_version')
+
+    def __init__(self, location, connectionPool=None):
+        """Set the location of the index document.
+        
+        Positional arguments:
+            location: str -- http(s) URL, file:// URL, or local path.
+        
+        Optional arguments:
+            connectionPool -- ConnectionPool instance for http(s) locations.
+        """
+        self.location = location
+        self._connectionPool = connectionPool
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def get(self, repoUrl):
+        """Return the entry for repoUrl as a dictionary, or None.
+        
+        The dictionary has the format of VersionInfo.as_dict().
+        If the index cannot be loaded, it is treated as empty.
+        """
+        with self._lock:
+            if self._entries is None:
+                try:
+                    self._entries = self._load()
+                except Exception:
+                    self._entries = {}
+            return self._entries.get(self._normalize(repoUrl), None)
+
+    def _load(self):
+        # Return a dictionary of entry dictionaries by URL.
+        text = self._read()
+        try:
+            document = json.loads(text)
+        except ValueError:
+            config = configparser.ConfigParser(interpolation=None)
+            config.read_string(text)
+            document = {
+                section: dict(config[section])
+                for section in config.sections()
+            }
+        entries = {}
+        for repoUrl in document:
+            entry = document[repoUrl]
+            if not isinstance(entry, dict):
+                continue
+
+            if not all(entry.get(key, None) for key in self.REQUIRED_KEYS):
+                continue
+
+            entries[self._normalize(repoUrl)] = {
+                key: str(entry[key])
+                for key in self.REQUIRED_KEYS + self.OPTIONAL_KEYS
+                if entry.get(key, None)
+            }
+        return entries
+
+    def _normalize(self, repoUrl):
+        return (repoUrl or '').rstrip('/').lower()
+
+    def _read(self):
+        # Return the index document as a string.
+        from urllib.request import url2pathname
+
+        parts = urlsplit(self.location)
+        if parts.scheme in ('http', 'https'):
+            response = self._connectionPool.get(self.location)
+            if response.status != 200:
+                raise OSError(f'HTTP status {response.status}')
+
+            return response.body.decode('utf-8')
+
+        if parts.scheme == 'file':
+            filePath = url2pathname(parts.path)
+        else:
+            filePath = self.location
+        with open(filePath, 'r', encoding='utf-8') as f:
+            return f.read()
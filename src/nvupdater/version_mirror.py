@@ -0,0 +1,73 @@
+"""Provide a class for a local mirror of the repositories' VERSION files.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+from urllib.parse import urlsplit
+
+
+class VersionMirror:
+    """VERSION files stored in a local directory tree.
+    
+    A repository URL like https://github.com/<owner>/<repo> is mapped to
+    <root>/github.com/<owner>/<repo>/raw/main/VERSION,
+    i.e. the same layout as on the server.
+    """
+    VERSION_PATH = 'raw/main/VERSION'
+
+    def __init__(self, root):
+        """Set the mirror's root directory.
+        
+        Positional arguments:
+            root: str -- local path or file:// URL of the root directory.
+        """
+        from urllib.request import url2pathname
+
+        parts = urlsplit(root)
+        if parts.scheme == 'file':
+            root = url2pathname(parts.path)
+        self.root = root.rstrip('/\\')
+
+    def get_path(self, repoUrl):
+        """Return the local path of the repository's VERSION file."""
+        parts = urlsplit(repoUrl)
+        repoPath = parts.path.strip('/')
+        return f'{self.root}/{parts.hostname}/{repoPath}/{self.VERSION_PATH}'
+
+    def get_repositories(self):
+        """Return a list with the URLs of all mirrored repositories."""
+        repoUrls = []
+        suffix = f'/{self.VERSION_PATH}'
+        for dirPath, __, fileNames in os.walk(self.root):
+            if 'VERSION' not in fileNames:
+                continue
+
+            filePath = f'{dirPath}/VERSION'.replace('\\', '/')
+            if not filePath.endswith(suffix):
+                continue
+
+            repoPath = filePath[len(self.root) + 1:-len(suffix)]
+            repoUrls.append(f'https://{repoPath}')
+        return sorted(repoUrls)
+
+    def read(self, repoUrl):
+        """Return the content of the repository's VERSION file.
+        
+        Raise OSError if the repository is not mirrored.
+        """
+        with open(self.get_path(repoUrl), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def write(self, repoUrl, versionInfo):
+        """Store versionInfo as the repository's VERSION file.
+        
+        The file is replaced atomically.
+        """
+        filePath = self.get_path(repoUrl)
+        os.makedirs(os.path.dirname(filePath), exist_ok=True)
+        tempPath = f'{filePath}.tmp'
+        with open(tempPath, 'w', encoding='utf-8') as f:
+            f.write(versionInfo)
+        os.replace(tempPath, filePath)
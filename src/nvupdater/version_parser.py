@@ -0,0 +1,169 @@
+"""Provide a parser for the release sections of VERSION files.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from nvupdater.semantic_version import Version
+
+
+class VersionInfo:
+    """The data of a release of a repository."""
+    __slots__ = ('version', 'downloadLink', 'sha256', 'apiVersion')
+
+    def __init__(self, version, downloadLink, sha256=None, apiVersion=None):
+        """Store the data.
+
+        Positional arguments:
+            version: Version -- the release's version.
+            downloadLink: str -- the download URL of the release.
+
+        Optional arguments:
+            sha256: str -- hex SHA-256 checksum of the download, if published.
+            apiVersion: tuple -- (major, minor) novelibre version required,
+                                 or None if not published.
+        """
+        self.version = version
+        self.downloadLink = downloadLink
+        self.sha256 = sha256
+        self.apiVersion = apiVersion
+
+    @classmethod
+    def from_dict(cls, data):
+        """Return a VersionInfo instance for a dictionary made by as_dict().
+
+        Raise ValueError or KeyError if the data is invalid.
+        """
+        return cls(
+            Version.parse(data['version']),
+            data['download_link'],
+            sha256=data.get('sha256', None),
+            apiVersion=_get_api_version(data.get('api_version', None)),
+        )
+
+    def as_dict(self):
+        """Return the data as a JSON serializable dictionary."""
+        data = dict(version=str(self.version), download_link=self.downloadLink)
+        if self.sha256:
+            data['sha256'] = self.sha256
+        if self.apiVersion is not None:
+            data['api_version'] = '.'.join(str(n) for n in self.apiVersion)
+        return data
+
+
+_REQUIRED_KEYS = {
+    b'version': 'version',
+    b'download_link': 'downloadLink',
+}
+_OPTIONAL_KEYS = {
+    b'sha256': 'sha256',
+    b'api_version': 'apiVersion',
+}
+_ALL_KEYS = dict(_REQUIRED_KEYS)
+_ALL_KEYS.update(_OPTIONAL_KEYS)
+RELEASE_PREFIX = b'RELEASE '
+# prefix of the section names of further releases
+
+
+def parse_api_version(text):
+    """Return a (major, minor) tuple for an API version string like "5.63".
+
+    Raise ValueError if text is not an API version.
+    """
+    major, minor = text.strip().split('.')[:2]
+    return int(major), int(minor)
+
+
+def parse_releases(data):
+    """Return a list of VersionInfo instances, newest first.
+
+    Positional arguments:
+        data: bytes or str -- content of a VERSION file (INI format).
+
+    The [LATEST] section is required. The optional [BETA] section
+    and sections named like [RELEASE 1.2.3] list further releases,
+    e.g. older ones that still work with older novelibre versions.
+    Each section may have an api_version key with the minimum
+    novelibre version, such as 5.63; an invalid value is ignored.
+    The file is scanned once. Keys are case-insensitive, "=" and ":"
+    are accepted as delimiters, and comment lines are skipped,
+    as with configparser.
+    Raise ValueError if [LATEST] or a key is missing,
+    or if a version is invalid.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    sections = {}
+    values = None
+    position = 0
+    length = len(data)
+    while position < length:
+        end = data.find(b'\n', position)
+        if end < 0:
+            end = length
+        line = data[position:end].strip()
+        position = end + 1
+        if not line or line[:1] in (b'#', b';'):
+            continue
+
+        if line[:1] == b'[':
+            name = line[1:-1].strip()
+            if name in (b'LATEST', b'BETA') or name.startswith(RELEASE_PREFIX):
+                values = sections.setdefault(name.decode('utf-8'), {})
+            else:
+                values = None
+            continue
+
+        if values is not None:
+            _add_value(line, values)
+    if 'LATEST' not in sections:
+        raise ValueError('Missing [LATEST] section')
+
+    releases = [
+        _get_version_info(section, values)
+        for section, values in sections.items()
+    ]
+    releases.sort(key=lambda release: release.version.key, reverse=True)
+    return releases
+
+
+def _add_value(line, values):
+    # Store the value of a "key = value" line, if the key is known.
+    separator = len(line)
+    for delimiter in (b'=', b':'):
+        index = line.find(delimiter)
+        if 0 <= index < separator:
+            separator = index
+    if separator == len(line):
+        return
+
+    key = _ALL_KEYS.get(line[:separator].strip().lower(), None)
+    if key is not None and key not in values:
+        values[key] = line[separator + 1:].strip().decode('utf-8')
+
+
+def _get_api_version(text):
+    # Return a (major, minor) tuple, or None if text is missing or invalid.
+    # The key is optional, so an invalid value does not reject the release.
+    if text is None:
+        return None
+
+    try:
+        return parse_api_version(text)
+
+    except ValueError:
+        return None
+
+
+def _get_version_info(section, values):
+    # Return a VersionInfo instance for the values of a section.
+    for key in _REQUIRED_KEYS.values():
+        if key not in values:
+            raise ValueError(f'Missing "{key}" in the [{section}] section')
+
+    return VersionInfo(
+        Version.parse(values['version']),
+        values['downloadLink'],
+        sha256=values.get('sha256', None),
+        apiVersion=_get_api_version(values.get('apiVersion', None)),
+    )
@@ -0,0 +1,344 @@
+"""Benchmark the nv_updater lookup engine against a local fake GitHub server.
+
+Usage:
+python benchmark_lookup.py [--plugins 1,10,100,500] [--latency 0.05]
+                           [--failure-rate 0.0] [--redirect none|same|host]
+                           [--modes sequential,pooled,cached,asyncio]
+                           [--rate 1000000] [--read-timeout 10] [--stall]
+
+For each mode and plugin count, print the wall time,
+the per-lookup latency (p50/p95), the peak memory,
+and the numbers of timed out and otherwise failed lookups.
+
+With --stall, the server accepts the connections but never responds.
+Then all lookups must be reported as timed out.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+from nvupdater.async_lookup_engine import AsyncLookupEngine
+from nvupdater.connection_pool import ConnectionPool
+from nvupdater.lookup_engine import LookupEngine
+from nvupdater.lookup_result import LookupResult
+from nvupdater.rate_limiter import RateLimiter
+from nvupdater.remote_data import RemoteData
+from nvupdater.version_cache import VersionCache
+
+MODES = ('sequential', 'pooled', 'cached', 'asyncio')
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Serve synthetic VERSION files.
+
+    Request paths look like /<plugin>/raw/main/VERSION.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    # header and body are written separately
+
+    def do_GET(self):
+        server = self.server
+        if server.stall:
+            # Keep the connection open without responding.
+            server.closed.wait()
+            self.close_connection = True
+            return
+
+        if server.redirect and not self.path.startswith('/raw/'):
+            # Simulate github.com redirecting to raw.githubusercontent.com.
+            self.send_response(302)
+            self.send_header(
+                'Location',
+                f'{server.redirectBase}/raw{self.path}',
+            )
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if server.latency:
+            time.sleep(server.latency)
+        if random.random() < server.failureRate:
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        pluginName = self.path.strip('/').split('/')[-4]
+        etag = f'"{pluginName}-1"'
+        if self.headers.get('If-None-Match', None) == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = (
+            '[LATEST]\n'
+            'version = 1.2.3\n'
+            f'download_link = https://example.com/{pluginName}.pyz\n'
+        ).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeGitHub:
+    """A local HTTP stand-in for github.com and raw.githubusercontent.com."""
+
+    def __init__(
+            self,
+            latency=0.0,
+            failureRate=0.0,
+            redirect='same',
+            stall=False,
+        ):
+        """Start the server(s) on free local ports.
+
+        Optional arguments:
+            latency: float -- delay in seconds per VERSION response.
+            failureRate: float -- share of responses failing with HTTP 500.
+            redirect: str -- 'none', 'same' (redirect on the same host),
+                             or 'host' (redirect to a second server).
+            stall: bool -- if True, never respond.
+        """
+        self._servers = []
+        self._closed = threading.Event()
+        main = self._start_server(latency, failureRate, stall)
+        if redirect == 'host':
+            raw = self._start_server(latency, failureRate, stall)
+            main.redirect = True
+            main.redirectBase = f'http://127.0.0.1:{raw.server_port}'
+        elif redirect == 'same':
+            main.redirect = True
+            main.redirectBase = f'http://127.0.0.1:{main.server_port}'
+        self.baseUrl = f'http://127.0.0.1:{main.server_port}'
+
+    def close(self):
+        self._closed.set()
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+    def _start_server(self, latency, failureRate, stall):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHubHandler)
+        server.daemon_threads = True
+        server.latency = latency
+        server.failureRate = failureRate
+        server.stall = stall
+        server.closed = self._closed
+        server.redirect = False
+        server.redirectBase = None
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._servers.append(server)
+        return server
+
+
+def percentile(values, share):
+    """Return the value below which the given share of values falls."""
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    index = min(int(round(share * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def run_mode(mode, repoUrls, cacheDir, workers, rate, readTimeout=None):
+    """Check all repositories in the given mode; return the statistics."""
+    latencies = []
+    cache = None
+    if mode == 'cached':
+        cache = VersionCache(f'{cacheDir}/versions.json', ttl=3600)
+    if mode == 'sequential':
+        # Like the original implementation:
+        # one lookup at a time, a new connection per request.
+        maxWorkers = 1
+        maxIdle = 0
+    else:
+        maxWorkers = workers
+        maxIdle = None
+    rateLimiter = RateLimiter(rate=rate, burst=workers)
+    remoteData = RemoteData(
+        cache=cache,
+        connectionPool=ConnectionPool(
+            readTimeout=readTimeout,
+            maxIdle=maxIdle,
+            rateLimiter=rateLimiter,
+        ),
+        retries=0,
+    )
+    if mode == 'asyncio':
+        lookupEngine = AsyncLookupEngine(
+            remoteData,
+            maxWorkers=maxWorkers,
+            readTimeout=readTimeout,
+            rateLimiter=rateLimiter,
+        )
+    else:
+        lookupEngine = LookupEngine(
+            remoteData.get_remote_data,
+            maxWorkers=maxWorkers,
+        )
+    tracemalloc.start()
+    start = time.perf_counter()
+    timedOut = 0
+    failed = 0
+    for result in lookupEngine.run(repoUrls):
+        latencies.append(result.timing.total)
+        if result.status == LookupResult.TIMED_OUT:
+            timedOut += 1
+        elif result.status != LookupResult.OK:
+            failed += 1
+    wallTime = time.perf_counter() - start
+    __, peakMemory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    remoteData.close()
+    if cache is not None:
+        cache.write()
+    return dict(
+        wall=wallTime,
+        p50=percentile(latencies, 0.5),
+        p95=percentile(latencies, 0.95),
+        peak=peakMemory,
+        timedOut=timedOut,
+        failed=failed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the nv_updater lookup engine.',
+    )
+    parser.add_argument(
+        '--plugins',
+        default='1,10,50,100,500',
+        help='comma-separated numbers of simulated plugins.',
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.05,
+        help='server delay per VERSION response in seconds.',
+    )
+    parser.add_argument(
+        '--failure-rate',
+        type=float,
+        default=0.0,
+        dest='failureRate',
+        help='share of responses failing with HTTP 500.',
+    )
+    parser.add_argument(
+        '--redirect',
+        choices=('none', 'same', 'host'),
+        default='host',
+        help='redirect behavior of the fake server.',
+    )
+    parser.add_argument(
+        '--modes',
+        default=','.join(MODES),
+        help='comma-separated modes: sequential, pooled, cached, asyncio.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=LookupEngine.MAX_WORKERS,
+        help='concurrency for the pooled, cached, and asyncio modes.',
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=1000000,
+        help='requests per second and host allowed by the rate limiter '
+        '(default: practically unlimited).',
+    )
+    parser.add_argument(
+        '--read-timeout',
+        type=float,
+        default=None,
+        dest='readTimeout',
+        help='timeout in seconds for each response.',
+    )
+    parser.add_argument(
+        '--stall',
+        action='store_true',
+        help='let the server accept connections but never respond; '
+        'exit with 1 unless all lookups time out.',
+    )
+    args = parser.parse_args()
+    pluginCounts = [int(number) for number in args.plugins.split(',')]
+    modes = [mode for mode in args.modes.split(',') if mode in MODES]
+
+    server = FakeGitHub(
+        latency=args.latency,
+        failureRate=args.failureRate,
+        redirect=args.redirect,
+        stall=args.stall,
+    )
+    print(
+        f'{"mode":<11}{"plugins":>8}{"wall s":>10}{"p50 ms":>10}'
+        f'{"p95 ms":>10}{"peak KiB":>10}{"timeout":>8}{"failed":>8}'
+    )
+    exitCode = 0
+    try:
+        for pluginCount in pluginCounts:
+            repoUrls = {
+                f'nv_plugin{i}': f'{server.baseUrl}/nv_plugin{i}'
+                for i in range(pluginCount)
+            }
+            with tempfile.TemporaryDirectory() as cacheDir:
+                for mode in modes:
+                    if mode == 'cached':
+                        # Warm up the cache; measure the second run.
+                        run_mode(
+                            mode,
+                            repoUrls,
+                            cacheDir,
+                            args.workers,
+                            args.rate,
+                            args.readTimeout,
+                        )
+                    stats = run_mode(
+                        mode,
+                        repoUrls,
+                        cacheDir,
+                        args.workers,
+                        args.rate,
+                        args.readTimeout,
+                    )
+                    print(
+                        f'{mode:<11}{pluginCount:>8}'
+                        f'{stats["wall"]:>10.3f}'
+                        f'{stats["p50"] * 1000:>10.1f}'
+                        f'{stats["p95"] * 1000:>10.1f}'
+                        f'{stats["peak"] / 1024:>10.0f}'
+                        f'{stats["timedOut"]:>8}'
+                        f'{stats["failed"]:>8}'
+                    )
+                    if args.stall and stats['timedOut'] != pluginCount:
+                        exitCode = 1
+    finally:
+        server.close()
+    return exitCode
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Benchmark the import cost of the nv_updater plugin at novelibre startup.
+
+Usage:
+python benchmark_startup.py [--package ARCHIVE] [--baseline ARCHIVE]
+                            [--runs 20]
+
+The package defaults to the newest nv_updater_v*.zip in ../dist,
+so build it first with build.py. The plugin module is extracted
+from the package archive into a temporary directory.
+
+Each run starts a fresh interpreter that first imports the modules
+novelibre has already loaded when it loads its plugins. Then it measures
+
+- "plugin load": loading the plugin module the way novelibre does:
+  the plugin directory is added to the module search path, the module
+  is imported by name, and its Plugin class is looked up;
+- "first check": importing the standard library modules that the
+  plugin imports on first use, when an update check runs.
+
+Before these imports were deferred, both phases were paid at startup.
+For each phase, print the median time and the number of modules loaded.
+With --baseline, the plugin load of an older package is measured
+as well, for a direct before/after comparison.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/nv_updater
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+from nvupdater.package_manifest import get_plugin_name
+
+PRELOADED = (
+    'tkinter',
+    'tkinter.ttk',
+)
+DEFERRED = (
+    'asyncio',
+    'concurrent.futures',
+    'email.parser',
+    'email.utils',
+    'hashlib',
+    'http.client',
+    'ssl',
+    'urllib.error',
+    'urllib.request',
+    'webbrowser',
+    'zipfile',
+)
+RUN_SCRIPT = '''
+import importlib
+import json
+import sys
+import time
+
+for moduleName in {preloaded!r}:
+    importlib.import_module(moduleName)
+results = []
+
+moduleCount = len(sys.modules)
+start = time.perf_counter()
+sys.path.append({pluginDir!r})
+pluginModule = importlib.import_module({moduleName!r})
+getattr(pluginModule, 'Plugin')
+results.append((
+    'plugin load',
+    time.perf_counter() - start,
+    len(sys.modules) - moduleCount,
+))
+
+moduleCount = len(sys.modules)
+start = time.perf_counter()
+for moduleName in {deferred!r}:
+    importlib.import_module(moduleName)
+results.append((
+    'first check',
+    time.perf_counter() - start,
+    len(sys.modules) - moduleCount,
+))
+print(json.dumps(results))
+'''
+
+
+def extract_plugin(archivePath, targetDir):
+    """Extract the plugin module from a package archive.
+
+    Positional arguments:
+        archivePath: str -- path to the package archive.
+        targetDir: str -- directory to extract the plugin module to.
+
+    Return the path to the extracted plugin module.
+    """
+    with zipfile.ZipFile(archivePath) as z:
+        pluginName = get_plugin_name(z)
+        return z.extract(pluginName, targetDir)
+
+
+def run_once(pluginFile):
+    """Measure the phases in a fresh interpreter.
+
+    Positional arguments:
+        pluginFile: str -- path to the plugin module.
+
+    Return a list of (phase, seconds, module count) lists.
+    """
+    script = RUN_SCRIPT.format(
+        preloaded=PRELOADED,
+        deferred=DEFERRED,
+        pluginDir=os.path.dirname(pluginFile),
+        moduleName=os.path.splitext(os.path.basename(pluginFile))[0],
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    return json.loads(output)
+
+
+def measure(archivePath, runs):
+    """Return the median seconds and module counts per phase.
+
+    Positional arguments:
+        archivePath: str -- path to the package archive.
+        runs: int -- number of fresh interpreters to measure.
+
+    Return a list of (phase, seconds, module count) tuples.
+    """
+    times = {}
+    moduleCounts = {}
+    with tempfile.TemporaryDirectory() as tempDir:
+        pluginFile = extract_plugin(archivePath, tempDir)
+        for __ in range(runs):
+            for phase, seconds, moduleCount in run_once(pluginFile):
+                times.setdefault(phase, []).append(seconds)
+                moduleCounts[phase] = moduleCount
+    return [
+        (phase, statistics.median(times[phase]), moduleCounts[phase])
+        for phase in times
+    ]
+
+
+def print_results(title, results):
+    """Print the median time and the module count per phase."""
+    print(title)
+    for phase, seconds, moduleCount in results:
+        print(f'  {phase:12} {seconds * 1000:7.1f} ms (median), '
+              f'{moduleCount} modules loaded')
+
+
+def main():
+    packages = sorted(
+        glob.glob('../dist/nv_updater_v*.zip'),
+        key=os.path.getmtime,
+    )
+    parser = argparse.ArgumentParser(
+        description='Benchmark the nv_updater plugin load time.',
+    )
+    parser.add_argument(
+        '--package',
+        default=packages[-1] if packages else None,
+        metavar='ARCHIVE',
+        help='package archive to measure; '
+             'default: the newest nv_updater_v*.zip in ../dist.',
+    )
+    parser.add_argument(
+        '--baseline',
+        metavar='ARCHIVE',
+        help='older package archive to compare the plugin load with.',
+    )
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=20,
+        help='number of fresh interpreters to measure.',
+    )
+    args = parser.parse_args()
+    if args.package is None:
+        sys.exit('No package found in ../dist; please run build.py first.')
+
+    for archivePath in (args.package, args.baseline):
+        if archivePath is not None and not os.path.isfile(archivePath):
+            sys.exit(f'{archivePath} not found.')
+
+    results = measure(args.package, args.runs)
+    print_results(args.package, results)
+    startupTime = results[0][1]
+    firstCheckTime = results[1][1]
+    print(f'Import cost removed from each startup: '
+          f'{firstCheckTime * 1000:.1f} ms '
+          f'({startupTime * 1000:.1f} ms instead of '
+          f'{(startupTime + firstCheckTime) * 1000:.1f} ms)')
+    if args.baseline is None:
+        return
+
+    baselineResults = measure(args.baseline, args.runs)
+    print_results(args.baseline, baselineResults)
+    baselineTime = baselineResults[0][1]
+    print(f'Plugin load: {baselineTime * 1000:.1f} ms before, '
+          f'{startupTime * 1000:.1f} ms after')
+
+
+if __name__ == '__main__':
+    main()
@@ -11,7 +11,9 @@ from shutil import copy2
 import sys
 
 sys.path.insert(0, f'{os.getcwd()}/../../novelibre/tools')
+sys.path.insert(0, f'{os.getcwd()}/../src')
 from package_builder import PackageBuilder
+from nvupdater.package_manifest import add_manifest
 
 VERSION = '5.4.5'
 
@@ -34,6 +36,10 @@ def main():
     pb = PluginBuilder(VERSION)
     pb.run()
 
+    # Add a content manifest for differential installation.
+    for extension in ('zip', 'pyz'):
+        add_manifest(f'../dist/{PluginBuilder.PRJ_NAME}_v{VERSION}.{extension}')
+
 
 if __name__ == '__main__':
     main()